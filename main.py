@@ -5,18 +5,37 @@ Quadtree vs Linear Search performance.
 """
 
 import time
+import numpy as np
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # Figures are only written to files; no GUI backend needed
 import matplotlib.pyplot as plt
-import matplotlib.patches as patches
+from matplotlib.collections import LineCollection
+from matplotlib.colors import ListedColormap
+from matplotlib.lines import Line2D
+from scipy.spatial import cKDTree
 from src.quadtree import QuadTree, Point, Rectangle
 from src.risk import RiskCalculator
+from src.dataio import read_csv_cached
 
 
+# Plot colors per risk level, highest risk first (legend order)
+RISK_COLORS = {
+    'Very High': 'darkred',
+    'High': 'red',
+    'Moderate': 'orange',
+    'Low': 'yellow',
+    'Very Low': 'lightgreen'
+}
+
+# Same colors as an array indexed by risk code (see RiskCalculator.get_risk_codes)
+RISK_LEVEL_COLORS = np.array([RISK_COLORS[level] for level in RiskCalculator.RISK_LEVELS])
+
 
 def load_earthquake_data(filepath):
     """Load earthquake data from CSV using Pandas."""
     print(f"Loading earthquake data from {filepath}...")
-    df = pd.read_csv(filepath)
+    df = read_csv_cached(filepath)
     
     # Remove any empty rows
     df = df.dropna(how='all')
@@ -30,6 +49,12 @@ def load_earthquake_data(filepath):
     if missing_cols:
         raise ValueError(f"Missing required columns: {missing_cols}")
     
+    # Downcast integer columns to the smallest integer type. Coordinates and
+    # magnitude stay float64: float32 rounding would show up in printed
+    # coordinates and shift risk scores and tree distances
+    for col in ['depth', 'intensity', 'frequency', 'plate_zone']:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    
     # Handle optional region_name column
     if 'region_name' not in df.columns:
         print("Warning: 'region_name' column not found. Adding default region names.")
@@ -49,11 +74,11 @@ def load_geological_data(faults_filepath, volcanoes_filepath):
     print(f"\nLoading geological data...")
     
     # Load faults data
-    faults_df = pd.read_csv(faults_filepath)
+    faults_df = read_csv_cached(faults_filepath)
     print(f"Loaded {len(faults_df)} fault records")
     
     # Load volcanoes data
-    volcanoes_df = pd.read_csv(volcanoes_filepath)
+    volcanoes_df = read_csv_cached(volcanoes_filepath)
     print(f"Loaded {len(volcanoes_df)} volcano records")
     
     print(f"\nFaults data columns: {list(faults_df.columns)}")
@@ -64,50 +89,56 @@ def load_geological_data(faults_filepath, volcanoes_filepath):
 
 
 def calculate_risk_scores(df, faults_tree=None, volcanoes_tree=None):
-    """Calculate risk scores for all data points using enhanced geological data (KDTree)."""
+    """Calculate risk scores for all data points using enhanced geological data (spatial tree)."""
     print("\nCalculating enhanced risk scores with geological data...")
-    risk_scores = []
-    fault_distances = []
-    volcano_distances = []
-    
-    for idx, row in df.iterrows():
-        # Use enhanced risk calculation with geological data
-        score = RiskCalculator.calculate_enhanced_risk_score(
-            magnitude=row['magnitude'],
-            depth=row['depth'],
-            intensity=row['intensity'],
-            frequency=row['frequency'],
-            lat=row['latitude'],
-            lon=row['longitude'],
-            faults_tree=faults_tree,
-            volcanoes_tree=volcanoes_tree,
-            plate_zone=row['plate_zone']
-        )
-        risk_scores.append(score)
-        
-        # Calculate and store distances for analysis
-        fault_dist = RiskCalculator.find_nearest_fault_distance(
-            row['latitude'], row['longitude'], faults_tree
-        )
-        volcano_dist = RiskCalculator.find_nearest_volcano_distance(
-            row['latitude'], row['longitude'], volcanoes_tree
-        )
-        fault_distances.append(fault_dist)
-        volcano_distances.append(volcano_dist)
     
-    df['risk_score'] = risk_scores
-    df['risk_level'] = df['risk_score'].apply(RiskCalculator.get_risk_level)
-    df['fault_distance_km'] = fault_distances
-    df['volcano_distance_km'] = volcano_distances
+    # Column-wise scoring: batched tree queries and one vectorized score pass
+    df = RiskCalculator.score_dataframe(df, faults_tree, volcanoes_tree)
     
     print(f"Enhanced risk score statistics:")
     print(df['risk_score'].describe())
-    print(f"\nAverage distance to nearest fault: {sum(fault_distances)/len(fault_distances):.2f} km")
-    print(f"Average distance to nearest volcano: {sum(volcano_distances)/len(volcano_distances):.2f} km")
+    print(f"\nAverage distance to nearest fault: {df['fault_distance_km'].mean():.2f} km")
+    print(f"Average distance to nearest volcano: {df['volcano_distance_km'].mean():.2f} km")
     
     return df
 
 
+def summarize_by_region(df):
+    """
+    Basic per-region statistics in a single sorted pass.
+
+    Rows are grouped by sorting on region name once; each group mean is then
+    an np.add.reduceat sum over the non-null values divided by their count,
+    so missing values are skipped as groupby().mean() skips them.
+
+    Returns:
+        DataFrame indexed by region_name, sorted by average risk score
+    """
+    names = df['region_name'].to_numpy()
+    valid = df['region_name'].notna().to_numpy()
+    order = np.flatnonzero(valid)[np.argsort(names[valid], kind='stable')]
+    regions, starts, counts = np.unique(names[order], return_index=True, return_counts=True)
+
+    def group_sum_count(column):
+        values = df[column].to_numpy(dtype=np.float64)[order]
+        missing = np.isnan(values)
+        sums = np.add.reduceat(np.where(missing, 0.0, values), starts)
+        return sums, np.add.reduceat(~missing, starts)
+
+    def group_mean(column):
+        sums, present = group_sum_count(column)
+        return np.divide(sums, present, out=np.full(len(sums), np.nan), where=present > 0)
+
+    region_stats = pd.DataFrame({
+        'Avg_Risk_Score': group_mean('risk_score'),
+        'Earthquake_Count': group_sum_count('risk_score')[1],
+        'Avg_Magnitude': group_mean('magnitude'),
+        'Avg_Lat': group_mean('latitude'),
+        'Avg_Lon': group_mean('longitude'),
+    }, index=pd.Index(regions, name='region_name'))
+    return region_stats.sort_values('Avg_Risk_Score', ascending=False)
+
+
 def build_quadtree(df):
     """Build quadtree from earthquake data."""
     print("\nBuilding QuadTree...")
@@ -122,40 +153,23 @@ def build_quadtree(df):
     lat_range = (lat_max - lat_min) / 2 * 1.2
     lon_range = (lon_max - lon_min) / 2 * 1.2
     
-    # Create quadtree
+    # Bulk-load the quadtree; payload is an (index, risk_score, magnitude) tuple
+    # of plain Python values (tolist converts each column in one pass instead
+    # of boxing one NumPy scalar per element)
     boundary = Rectangle(lon_center, lat_center, lon_range, lat_range)
-    qt = QuadTree(boundary, capacity=4)
-    
-    # Insert points
-    for idx, row in df.iterrows():
-        point = Point(
-            row['longitude'],
-            row['latitude'],
-            data={
-                'index': idx,
-                'risk_score': row['risk_score'],
-                'magnitude': row['magnitude']
-            }
-        )
-        qt.insert(point)
+    payloads = zip(df.index.tolist(), df['risk_score'].to_numpy().tolist(),
+                   df['magnitude'].to_numpy().tolist())
+    qt = QuadTree.bulk_load(boundary, df['longitude'].to_numpy(), df['latitude'].to_numpy(),
+                            payloads)
     
     print(f"QuadTree built with {qt.count_nodes()} nodes")
     return qt
 
 
-def linear_search(df, center_lat, center_lon, radius):
-    """Linear search for points within radius."""
-    results = []
-    
-    for idx, row in df.iterrows():
-        distance = RiskCalculator.calculate_distance(
-            center_lon, center_lat,
-            row['longitude'], row['latitude']
-        )
-        if distance <= radius:
-            results.append(idx)
-    
-    return results
+def linear_search(lons, lats, center_lat, center_lon, radius):
+    """Linear search for points within radius (vectorized over all points)."""
+    distance_sq = RiskCalculator.calculate_distance_sq(center_lon, center_lat, lons, lats)
+    return np.nonzero(distance_sq <= radius * radius)[0]
 
 
 def quadtree_search(qt, center_lat, center_lon, radius):
@@ -177,59 +191,72 @@ def compare_performance(df, qt, num_queries=100):
     lat_std = df['latitude'].std()
     lon_std = df['longitude'].std()
     
+    # Coordinate arrays for the linear baseline, extracted once outside the timing loop
+    lons = df['longitude'].to_numpy()
+    lats = df['latitude'].to_numpy()
+    
+    # Query center grid, computed once and shared by every radius and method
+    offsets = (np.arange(num_queries) % 10 - 5) / 10
+    center_lats = lat_mean + offsets * lat_std
+    center_lons = lon_mean + offsets * lon_std
+    centers = np.column_stack([center_lons, center_lats])
+    
+    # Reference: SciPy cKDTree built once, queried with all centers in one batch
+    kdtree = cKDTree(np.column_stack([lons, lats]))
+    
     # Test with different radii
     radii = [0.5, 1.0, 2.0, 3.0]
     
     results = []
     
+    # Warm-up: one untimed call of each search so first-call overhead
+    # does not land in the first measurement
+    quadtree_search(qt, center_lats[0], center_lons[0], radii[0])
+    linear_search(lons, lats, center_lats[0], center_lons[0], radii[0])
+    kdtree.query_ball_point(centers, radii[0], workers=-1)
+    
     for radius in radii:
         print(f"\nRadius: {radius}°")
         
-        # QuadTree search timing
+        # Time both searches on each query center in a single pass
         qt_times = []
+        linear_times = []
         qt_results_count = []
         
         for i in range(num_queries):
-            # Random center point
-            center_lat = lat_mean + (i % 10 - 5) * lat_std / 10
-            center_lon = lon_mean + (i % 10 - 5) * lon_std / 10
-            
-            start = time.perf_counter()
-            qt_results = quadtree_search(qt, center_lat, center_lon, radius)
-            end = time.perf_counter()
+            t0 = time.perf_counter_ns()
+            qt_results = quadtree_search(qt, center_lats[i], center_lons[i], radius)
+            t1 = time.perf_counter_ns()
+            linear_search(lons, lats, center_lats[i], center_lons[i], radius)
+            t2 = time.perf_counter_ns()
             
-            qt_times.append(end - start)
+            qt_times.append(t1 - t0)
+            linear_times.append(t2 - t1)
             qt_results_count.append(len(qt_results))
         
-        # Linear search timing
-        linear_times = []
-        linear_results_count = []
+        # cKDTree batch timing (one call answers every query)
+        start = time.perf_counter_ns()
+        kdtree.query_ball_point(centers, radius, workers=-1)
+        end = time.perf_counter_ns()
         
-        for i in range(num_queries):
-            center_lat = lat_mean + (i % 10 - 5) * lat_std / 10
-            center_lon = lon_mean + (i % 10 - 5) * lon_std / 10
-            
-            start = time.perf_counter()
-            linear_results = linear_search(df, center_lat, center_lon, radius)
-            end = time.perf_counter()
-            
-            linear_times.append(end - start)
-            linear_results_count.append(len(linear_results))
+        # Calculate statistics (timings are integer nanoseconds); the median
+        # per-query time is less sensitive to scheduler outliers than the mean
+        median_qt_time = np.median(qt_times) / 1e6  # ms
+        median_linear_time = np.median(linear_times) / 1e6  # ms
+        avg_kdtree_time = (end - start) / num_queries / 1e6  # ms
+        speedup = median_linear_time / median_qt_time if median_qt_time > 0 else 0
         
-        # Calculate statistics
-        avg_qt_time = sum(qt_times) / len(qt_times) * 1000  # ms
-        avg_linear_time = sum(linear_times) / len(linear_times) * 1000  # ms
-        speedup = avg_linear_time / avg_qt_time if avg_qt_time > 0 else 0
-        
-        print(f"  QuadTree avg time: {avg_qt_time:.4f} ms")
-        print(f"  Linear avg time:   {avg_linear_time:.4f} ms")
-        print(f"  Speedup:           {speedup:.2f}x")
-        print(f"  Avg results found: {sum(qt_results_count)/len(qt_results_count):.1f}")
+        print(f"  QuadTree median time: {median_qt_time:.4f} ms")
+        print(f"  Linear median time:   {median_linear_time:.4f} ms")
+        print(f"  cKDTree avg time:     {avg_kdtree_time:.4f} ms (batched)")
+        print(f"  Speedup:              {speedup:.2f}x")
+        print(f"  Avg results found:    {sum(qt_results_count)/len(qt_results_count):.1f}")
         
         results.append({
             'radius': radius,
-            'quadtree_time': avg_qt_time,
-            'linear_time': avg_linear_time,
+            'quadtree_time': median_qt_time,
+            'linear_time': median_linear_time,
+            'kdtree_time': avg_kdtree_time,
             'speedup': speedup
         })
     
@@ -244,17 +271,24 @@ def visualize_risk_map(df, qt, output_file='output/visualizations/risk_map.png')
     
     fig, axes = plt.subplots(2, 2, figsize=(16, 14))
     
+    # Plotted columns as arrays, extracted once for all four panels
+    lons = df['longitude'].to_numpy()
+    lats = df['latitude'].to_numpy()
+    magnitudes = df['magnitude'].to_numpy()
+    risk_scores = df['risk_score'].to_numpy()
+    
     # 1. Risk Score Heatmap
     ax1 = axes[0, 0]
     scatter1 = ax1.scatter(
-        df['longitude'],
-        df['latitude'],
-        c=df['risk_score'],
-        s=df['magnitude'] * 20,
+        lons,
+        lats,
+        c=risk_scores,
+        s=magnitudes * 20,
         cmap='YlOrRd',
         alpha=0.7,
         edgecolors='black',
-        linewidth=0.5
+        linewidth=0.5,
+        rasterized=True
     )
     ax1.set_xlabel('Longitude')
     ax1.set_ylabel('Latitude')
@@ -265,45 +299,51 @@ def visualize_risk_map(df, qt, output_file='output/visualizations/risk_map.png')
     
     # 2. Risk Level Categories
     ax2 = axes[0, 1]
-    risk_colors = {
-        'Very High': 'darkred',
-        'High': 'red',
-        'Moderate': 'orange',
-        'Low': 'yellow',
-        'Very Low': 'lightgreen'
-    }
-    
-    for level, color in risk_colors.items():
-        level_data = df[df['risk_level'] == level]
-        if len(level_data) > 0:
-            ax2.scatter(
-                level_data['longitude'],
-                level_data['latitude'],
-                c=color,
-                s=80,
-                label=level,
-                alpha=0.7,
-                edgecolors='black',
-                linewidth=0.5
-            )
+    
+    # One scatter call colored by integer risk code (0='Very Low' ... 4='Very High')
+    risk_codes = df['risk_level'].cat.codes.to_numpy()
+    level_cmap = ListedColormap(RISK_LEVEL_COLORS)
+    ax2.scatter(
+        lons,
+        lats,
+        c=risk_codes,
+        cmap=level_cmap,
+        vmin=0,
+        vmax=len(RiskCalculator.RISK_LEVELS) - 1,
+        s=80,
+        alpha=0.7,
+        edgecolors='black',
+        linewidth=0.5,
+        rasterized=True
+    )
+    
+    # Legend lists the levels present, highest risk first
+    present_levels = set(RiskCalculator.RISK_LEVELS[np.unique(risk_codes)])
+    legend_handles = [
+        Line2D([], [], marker='o', linestyle='', markersize=9, alpha=0.7,
+               markerfacecolor=color, markeredgecolor='black', markeredgewidth=0.5,
+               label=level)
+        for level, color in RISK_COLORS.items() if level in present_levels
+    ]
     
     ax2.set_xlabel('Longitude')
     ax2.set_ylabel('Latitude')
     ax2.set_title('Risk Level Categories', fontsize=12, fontweight='bold')
-    ax2.legend(loc='best')
+    ax2.legend(handles=legend_handles, loc='best')
     ax2.grid(True, alpha=0.3)
     
     # 3. Magnitude vs Depth
     ax3 = axes[1, 0]
     scatter3 = ax3.scatter(
-        df['magnitude'],
-        df['depth'],
-        c=df['risk_score'],
+        magnitudes,
+        df['depth'].to_numpy(),
+        c=risk_scores,
         s=100,
         cmap='YlOrRd',
         alpha=0.7,
         edgecolors='black',
-        linewidth=0.5
+        linewidth=0.5,
+        rasterized=True
     )
     ax3.set_xlabel('Magnitude')
     ax3.set_ylabel('Depth (km)')
@@ -316,11 +356,10 @@ def visualize_risk_map(df, qt, output_file='output/visualizations/risk_map.png')
     # 4. Risk Distribution
     ax4 = axes[1, 1]
     risk_counts = df['risk_level'].value_counts()
-    risk_order = ['Very Low', 'Low', 'Moderate', 'High', 'Very High']
+    risk_order = list(RiskCalculator.RISK_LEVELS)
     risk_counts = risk_counts.reindex(risk_order, fill_value=0)
     
-    colors = [risk_colors.get(level, 'gray') for level in risk_order]
-    bars = ax4.bar(risk_order, risk_counts, color=colors, edgecolor='black', linewidth=1.5)
+    bars = ax4.bar(risk_order, risk_counts, color=RISK_LEVEL_COLORS, edgecolor='black', linewidth=1.5)
     ax4.set_xlabel('Risk Level')
     ax4.set_ylabel('Number of Locations')
     ax4.set_title('Risk Level Distribution', fontsize=12, fontweight='bold')
@@ -334,9 +373,11 @@ def visualize_risk_map(df, qt, output_file='output/visualizations/risk_map.png')
                 ha='center', va='bottom', fontweight='bold')
     
     plt.tight_layout()
-    plt.savefig(output_file, dpi=150, bbox_inches='tight')
+    fig.savefig(output_file, dpi=150)
     print(f"Risk map saved to {output_file}")
     
+    plt.close(fig)
+    
     return fig
 
 
@@ -348,45 +389,54 @@ def visualize_quadtree_structure(qt, df, output_file='output/visualizations/quad
     
     fig, ax = plt.subplots(figsize=(12, 10))
     
-    # Draw quadtree boundaries
-    def draw_boundary(node, depth=0):
-        if node is None:
-            return
-        
+    # Collect quadtree boundary edges with an iterative walk
+    edges = []
+    depths = []
+    stack = [(qt, 0)]
+    while stack:
+        node, depth = stack.pop()
         rect = node.boundary
-        alpha = max(0.1, 1.0 - depth * 0.15)
-        color = plt.cm.viridis(depth / 8)
-        
-        rectangle = patches.Rectangle(
-            (rect.x - rect.width, rect.y - rect.height),
-            rect.width * 2,
-            rect.height * 2,
-            linewidth=1,
-            edgecolor=color,
-            facecolor='none',
-            alpha=alpha
-        )
-        ax.add_patch(rectangle)
+        edges.append((rect.xmin, rect.ymin, rect.xmax, rect.ymax))
+        depths.append(depth)
         
         if node.divided:
-            draw_boundary(node.northeast, depth + 1)
-            draw_boundary(node.northwest, depth + 1)
-            draw_boundary(node.southeast, depth + 1)
-            draw_boundary(node.southwest, depth + 1)
-    
-    draw_boundary(qt)
+            stack.append((node.northeast, depth + 1))
+            stack.append((node.northwest, depth + 1))
+            stack.append((node.southeast, depth + 1))
+            stack.append((node.southwest, depth + 1))
+    
+    # Each boundary is a closed 5-vertex outline, built as one (N, 5, 2) array
+    xmin, ymin, xmax, ymax = np.array(edges).T
+    outlines = np.stack([
+        np.column_stack([xmin, ymin]),
+        np.column_stack([xmax, ymin]),
+        np.column_stack([xmax, ymax]),
+        np.column_stack([xmin, ymax]),
+        np.column_stack([xmin, ymin]),
+    ], axis=1)
+    
+    # Draw all boundaries as one line collection; deeper nodes are fainter
+    depths = np.array(depths)
+    edgecolors = plt.cm.viridis(depths / 8)
+    edgecolors[:, 3] = np.maximum(0.1, 1.0 - depths * 0.15)
+    ax.add_collection(LineCollection(
+        outlines,
+        linewidths=1,
+        colors=edgecolors
+    ))
     
     # Overlay earthquake points
     scatter = ax.scatter(
-        df['longitude'],
-        df['latitude'],
-        c=df['risk_score'],
+        df['longitude'].to_numpy(),
+        df['latitude'].to_numpy(),
+        c=df['risk_score'].to_numpy(),
         s=50,
         cmap='YlOrRd',
         alpha=0.8,
         edgecolors='black',
         linewidth=0.5,
-        zorder=5
+        zorder=5,
+        rasterized=True
     )
     
     ax.set_xlabel('Longitude')
@@ -407,9 +457,11 @@ def visualize_quadtree_structure(qt, df, output_file='output/visualizations/quad
             bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
     
     plt.tight_layout()
-    plt.savefig(output_file, dpi=150, bbox_inches='tight')
+    fig.savefig(output_file, dpi=150)
     print(f"QuadTree structure saved to {output_file}")
     
+    plt.close(fig)
+    
     return fig
 
 
@@ -423,15 +475,6 @@ def visualize_regional_analysis(df, regions_df, regional_analysis, output_file='
     
     fig, axes = plt.subplots(2, 2, figsize=(18, 14))
     
-    # Risk colors mapping
-    risk_colors = {
-        'Very High': 'darkred',
-        'High': 'red',
-        'Moderate': 'orange',
-        'Low': 'yellow',
-        'Very Low': 'lightgreen'
-    }
-    
     # 1. Regional Risk Score Map
     ax1 = axes[0, 0]
     
@@ -448,11 +491,14 @@ def visualize_regional_analysis(df, regions_df, regional_analysis, output_file='
             linewidth=1
         )
         
-        # Add region labels
-        for idx, row in regional_stats.iterrows():
+        # Add region labels (abbreviated names)
+        short_names = regional_stats['region_name'].str[:8].to_numpy()
+        for name, lon, lat in zip(short_names,
+                                  regional_stats['longitude'].to_numpy(),
+                                  regional_stats['latitude'].to_numpy()):
             ax1.annotate(
-                row['region_name'][:8],  # Abbreviated name
-                (row['longitude'], row['latitude']),
+                name,
+                (lon, lat),
                 xytext=(5, 5),
                 textcoords='offset points',
                 fontsize=8,
@@ -478,8 +524,7 @@ def visualize_regional_analysis(df, regions_df, regional_analysis, output_file='
         bars = ax2.barh(
             provincial_stats_sorted['province'],
             provincial_stats_sorted['avg_risk_score'],
-            color=[risk_colors.get(RiskCalculator.get_risk_level(score), 'gray') 
-                   for score in provincial_stats_sorted['avg_risk_score']],
+            color=RISK_LEVEL_COLORS[RiskCalculator.get_risk_codes(provincial_stats_sorted['avg_risk_score'])],
             edgecolor='black',
             linewidth=1
         )
@@ -508,7 +553,7 @@ def visualize_regional_analysis(df, regions_df, regional_analysis, output_file='
         
         # Create stacked bar chart
         risk_by_province.plot(kind='bar', stacked=True, ax=ax3, 
-                             color=[risk_colors.get(col, 'gray') for col in risk_by_province.columns],
+                             color=[RISK_COLORS.get(col, 'gray') for col in risk_by_province.columns],
                              edgecolor='black', linewidth=0.5)
     
     ax3.set_xlabel('Province')
@@ -527,15 +572,14 @@ def visualize_regional_analysis(df, regions_df, regional_analysis, output_file='
         bars = ax4.barh(
             range(len(top_regions)),
             top_regions['risk_score'],
-            color=[risk_colors.get(RiskCalculator.get_risk_level(score), 'gray') 
-                   for score in top_regions['risk_score']],
+            color=RISK_LEVEL_COLORS[RiskCalculator.get_risk_codes(top_regions['risk_score'])],
             edgecolor='black',
             linewidth=1
         )
         
         # Set y-tick labels with region names and provinces
-        labels = [f"{row['region_name'][:12]} ({row['province'][:8]})" 
-                 for _, row in top_regions.iterrows()]
+        labels = (top_regions['region_name'].str[:12] + ' (' +
+                  top_regions['province'].str[:8] + ')').to_numpy()
         ax4.set_yticks(range(len(top_regions)))
         ax4.set_yticklabels(labels, fontsize=9)
         
@@ -550,9 +594,12 @@ def visualize_regional_analysis(df, regions_df, regional_analysis, output_file='
     ax4.grid(True, axis='x', alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig(output_file, dpi=150, bbox_inches='tight')
+    # Keep the tight bbox here: the province legend sits outside its axes
+    fig.savefig(output_file, dpi=150, bbox_inches='tight')
     print(f"Regional analysis visualization saved to {output_file}")
     
+    plt.close(fig)
+    
     return fig
 
 
@@ -598,7 +645,9 @@ def main():
     print("ENHANCED SUMMARY WITH GEOLOGICAL DATA")
     print("="*60)
     print(f"\nRisk Level Distribution:")
-    print(df['risk_level'].value_counts().sort_index())
+    # risk_level is an ordered categorical: list levels in risk order and
+    # leave out levels no location falls into
+    print(df['risk_level'].value_counts().sort_index()[lambda counts: counts > 0])
     
 
     print(f"\nTop 5 Highest Risk Locations:")
@@ -629,7 +678,8 @@ def main():
 
 
             print(f"\nExporting regional statistics to 'output/data/regional_risk_analysis.csv'...")
-            regional_stats.to_csv('output/data/regional_risk_analysis.csv', index=False)
+            regional_stats.to_csv('output/data/regional_risk_analysis.csv', index=False,
+                                  float_format='%.4f')
             print(f"Regional statistics saved successfully!")
         
         if regional_analysis['provincial_stats'] is not None:
@@ -638,7 +688,8 @@ def main():
 
 
             print(f"\nExporting provincial statistics to 'output/data/provincial_risk_analysis.csv'...")
-            provincial_stats.to_csv('output/data/provincial_risk_analysis.csv', index=False)
+            provincial_stats.to_csv('output/data/provincial_risk_analysis.csv', index=False,
+                                    float_format='%.4f')
             print(f"Provincial statistics saved successfully!")
         
 
@@ -655,26 +706,23 @@ def main():
         if regional_analysis['regional_stats'] is not None:
             print(f"\nTop 5 Highest Risk Regions:")
             top_regions = regional_analysis['regional_stats'].nlargest(5, 'risk_score')
-            for idx, row in top_regions.iterrows():
-                print(f"  {row['region_name']} ({row['province']}): Risk Score {row['risk_score']:.2f}")
+            for name, province, score in zip(top_regions['region_name'].to_numpy(),
+                                             top_regions['province'].to_numpy(),
+                                             top_regions['risk_score'].to_numpy()):
+                print(f"  {name} ({province}): Risk Score {score:.2f}")
         
         if regional_analysis['provincial_stats'] is not None:
             print(f"\nProvincial Risk Summary:")
-            for idx, row in regional_analysis['provincial_stats'].iterrows():
-                print(f"  {row['province']}: Avg Risk {row['avg_risk_score']:.2f}, {row['regions_affected']} regions")
+            provincial_stats = regional_analysis['provincial_stats']
+            for province, avg_score, regions in zip(provincial_stats['province'].to_numpy(),
+                                                    provincial_stats['avg_risk_score'].to_numpy(),
+                                                    provincial_stats['regions_affected'].to_numpy()):
+                print(f"  {province}: Avg Risk {avg_score:.2f}, {regions} regions")
     else:
         # Fallback to basic regional analysis if regions data not available
         print(f"\nBasic Regional Risk Analysis:")
-        region_stats = df.groupby('region_name').agg({
-            'risk_score': ['mean', 'count'],
-            'magnitude': 'mean',
-            'latitude': 'mean',
-            'longitude': 'mean'
-        }).round(2)
-        
-        region_stats.columns = ['Avg_Risk_Score', 'Earthquake_Count', 'Avg_Magnitude', 'Avg_Lat', 'Avg_Lon']
-        region_stats = region_stats.sort_values('Avg_Risk_Score', ascending=False)
-        print(region_stats.to_string())
+        region_stats = summarize_by_region(df)
+        print(region_stats.to_string(float_format='{:.2f}'.format))
     
     # Geological analysis
     print(f"\nGeological Analysis:")
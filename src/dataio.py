@@ -0,0 +1,58 @@
+"""
+Data loading helpers.
+Caches parsed CSV files next to the source so repeated runs skip CSV parsing.
+"""
+
+import hashlib
+import os
+import tempfile
+import pandas as pd
+
+
+def read_csv_cached(filepath, **read_csv_kwargs):
+    """
+    Read a CSV file, reusing a binary cache of the parsed DataFrame.
+
+    The cache is stored as '<name>.pkl' beside the CSV and is used only while
+    it is newer than the CSV, so editing the CSV invalidates it automatically.
+    Calls with read_csv_kwargs get their own '<name>.<hash>.pkl' cache, keyed
+    on the arguments, so changing dtype/usecols never returns a stale frame.
+
+    The cache is written to a temporary file and renamed into place, so an
+    interrupted run cannot leave a truncated cache behind; a cache that still
+    fails to load is ignored and rebuilt from the CSV. Cache files are read
+    with pickle, which can run arbitrary code: only use this on a trusted
+    data directory.
+
+    Args:
+        filepath: Path to CSV file
+        **read_csv_kwargs: Extra arguments passed to pandas.read_csv
+
+    Returns:
+        DataFrame with the file contents
+    """
+    cache_path = os.path.splitext(filepath)[0]
+    if read_csv_kwargs:
+        key = repr(sorted(read_csv_kwargs.items())).encode()
+        cache_path += '.' + hashlib.sha1(key).hexdigest()[:12]
+    cache_path += '.pkl'
+
+    if (os.path.exists(cache_path) and
+            os.path.getmtime(cache_path) >= os.path.getmtime(filepath)):
+        try:
+            return pd.read_pickle(cache_path)
+        except Exception:
+            pass  # Corrupt or unreadable cache: rebuild it from the CSV
+
+    df = pd.read_csv(filepath, **read_csv_kwargs)
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(cache_path) or '.')
+        os.close(fd)
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Read-only data directory: caching is optional
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return df
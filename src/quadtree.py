@@ -3,9 +3,15 @@ Quadtree implementation for spatial partitioning of earthquake data.
 Uses Divide & Conquer approach for efficient spatial queries.
 """
 
+from bisect import bisect_left
+
+import numpy as np
+
 class Point:
     """Represents a point in 2D space with associated data."""
     
+    __slots__ = ('x', 'y', 'data')
+    
     def __init__(self, x, y, data=None):
         self.x = x
         self.y = y
@@ -18,23 +24,35 @@ class Point:
 class Rectangle:
     """Represents a rectangular boundary."""
     
+    __slots__ = ('x', 'y', 'width', 'height', 'xmin', 'xmax', 'ymin', 'ymax')
+    
     def __init__(self, x, y, width, height):
         self.x = x  # Center x
         self.y = y  # Center y
         self.width = width
         self.height = height
+        # Edge coordinates, computed once for the containment tests
+        self.xmin = x - width
+        self.xmax = x + width
+        self.ymin = y - height
+        self.ymax = y + height
     
     def contains(self, point):
         """Check if point is within this rectangle."""
-        return (self.x - self.width <= point.x <= self.x + self.width and
-                self.y - self.height <= point.y <= self.y + self.height)
+        return (self.xmin <= point.x <= self.xmax and
+                self.ymin <= point.y <= self.ymax)
+    
+    def contains_rect(self, other):
+        """Check if another rectangle lies entirely within this rectangle."""
+        return (self.xmin <= other.xmin and other.xmax <= self.xmax and
+                self.ymin <= other.ymin and other.ymax <= self.ymax)
     
     def intersects(self, range_rect):
         """Check if this rectangle intersects with another rectangle."""
-        return not (range_rect.x - range_rect.width > self.x + self.width or
-                   range_rect.x + range_rect.width < self.x - self.width or
-                   range_rect.y - range_rect.height > self.y + self.height or
-                   range_rect.y + range_rect.height < self.y - self.height)
+        return not (range_rect.xmin > self.xmax or
+                   range_rect.xmax < self.xmin or
+                   range_rect.ymin > self.ymax or
+                   range_rect.ymax < self.ymin)
 
 
 class QuadTree:
@@ -43,18 +61,27 @@ class QuadTree:
     Uses Divide & Conquer to recursively partition 2D space.
     """
     
-    def __init__(self, boundary, capacity=4):
+    __slots__ = ('boundary', 'capacity', 'max_depth', 'depth', 'points', 'divided',
+                 '_node_count', 'northeast', 'northwest', 'southeast', 'southwest')
+    
+    def __init__(self, boundary, capacity=32, max_depth=16, depth=0):
         """
         Initialize QuadTree node.
         
         Args:
             boundary: Rectangle defining the bounds of this node
             capacity: Maximum points before subdivision
+            max_depth: Depth at which nodes stop subdividing and keep every
+                point they receive (bounds the tree on co-located points)
+            depth: Depth of this node below the root
         """
         self.boundary = boundary
         self.capacity = capacity
+        self.max_depth = max_depth
+        self.depth = depth
         self.points = []
         self.divided = False
+        self._node_count = 1  # Nodes in this subtree, kept current on insert
         
         # Child quadrants (NE, NW, SE, SW)
         self.northeast = None
@@ -68,20 +95,22 @@ class QuadTree:
         y = self.boundary.y
         w = self.boundary.width / 2
         h = self.boundary.height / 2
+        capacity, max_depth, depth = self.capacity, self.max_depth, self.depth + 1
         
         ne_boundary = Rectangle(x + w, y + h, w, h)
-        self.northeast = QuadTree(ne_boundary, self.capacity)
+        self.northeast = QuadTree(ne_boundary, capacity, max_depth, depth)
         
         nw_boundary = Rectangle(x - w, y + h, w, h)
-        self.northwest = QuadTree(nw_boundary, self.capacity)
+        self.northwest = QuadTree(nw_boundary, capacity, max_depth, depth)
         
         se_boundary = Rectangle(x + w, y - h, w, h)
-        self.southeast = QuadTree(se_boundary, self.capacity)
+        self.southeast = QuadTree(se_boundary, capacity, max_depth, depth)
         
         sw_boundary = Rectangle(x - w, y - h, w, h)
-        self.southwest = QuadTree(sw_boundary, self.capacity)
+        self.southwest = QuadTree(sw_boundary, capacity, max_depth, depth)
         
         self.divided = True
+        self._node_count += 4
     
     def insert(self, point):
         """
@@ -97,8 +126,9 @@ class QuadTree:
         if not self.boundary.contains(point):
             return False
         
-        # If capacity not reached, add point here
-        if len(self.points) < self.capacity:
+        # If capacity not reached, add point here; nodes at max_depth never
+        # subdivide, so points that cannot be separated stop here
+        if len(self.points) < self.capacity or self.depth >= self.max_depth:
             self.points.append(point)
             return True
         
@@ -106,18 +136,133 @@ class QuadTree:
         if not self.divided:
             self.subdivide()
         
-        # Try inserting into child quadrants
-        if self.northeast.insert(point):
-            return True
-        if self.northwest.insert(point):
-            return True
-        if self.southeast.insert(point):
-            return True
-        if self.southwest.insert(point):
-            return True
+        # Quadrants partition this node, so two comparisons against the
+        # children's shared edges pick the only child that can take the point
+        # (ties on a midline go north/east, as when children were tried in turn)
+        edges = self.northeast.boundary
+        if point.y >= edges.ymin:
+            chosen = self.northeast if point.x >= edges.xmin else self.northwest
+        else:
+            chosen = self.southeast if point.x >= edges.xmin else self.southwest
+        
+        # Children's edges are computed as center +/- half-size, so rounding
+        # can leave a point inside this node but outside the chosen child;
+        # then try the other children in NE, NW, SE, SW order
+        children = (chosen, self.northeast, self.northwest, self.southeast, self.southwest)
+        for i, child in enumerate(children):
+            if i and child is chosen:
+                continue
+            # Add any nodes the child created, even if it then rejected the point
+            child_nodes = child._node_count
+            inserted = child.insert(point)
+            self._node_count += child._node_count - child_nodes
+            if inserted:
+                return True
         
         return False
     
+    def insert_bulk(self, xs, ys, data=None):
+        """
+        Insert many points from parallel coordinate sequences.
+        
+        Args:
+            xs: Sequence of x coordinates
+            ys: Sequence of y coordinates
+            data: Optional sequence of payloads, one per point
+            
+        Returns:
+            int: Number of points successfully inserted
+        """
+        if data is None:
+            data = [None] * len(xs)
+        
+        inserted = 0
+        for x, y, payload in zip(xs, ys, data):
+            if self.insert(Point(x, y, payload)):
+                inserted += 1
+        return inserted
+    
+    @classmethod
+    def bulk_load(cls, boundary, xs, ys, data=None, capacity=32, max_depth=16):
+        """
+        Build a quadtree from many points at once using a Morton (Z-order) sort.
+        
+        Each point gets a Morton code from the quadrant it falls in at every
+        level down to max_depth, using the same midlines as subdivide. After a
+        single argsort, the points of every node form a contiguous slice, so
+        the tree is built top-down by splitting slices instead of inserting
+        points one at a time. Points are kept in the leaves; as with insert,
+        a leaf at max_depth may hold more than capacity points.
+        
+        Args:
+            boundary: Rectangle defining the bounds of the root node
+            xs: Sequence of x coordinates
+            ys: Sequence of y coordinates
+            data: Optional sequence of payloads, one per point
+            capacity: Maximum points per leaf before subdivision
+            max_depth: Maximum number of subdivision levels (at most 32)
+            
+        Returns:
+            QuadTree containing every point that lies within boundary
+            
+        Raises:
+            ValueError: If max_depth exceeds 32, the deepest path a 64-bit
+                Morton code can hold; use insert_bulk for deeper trees
+        """
+        if max_depth > 32:
+            raise ValueError(f"bulk_load supports max_depth <= 32, got {max_depth}")
+        
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        data = [None] * len(xs) if data is None else list(data)
+        
+        # Drop points outside the root, as insert would reject them
+        inside = np.flatnonzero((xs >= boundary.xmin) & (xs <= boundary.xmax) &
+                                (ys >= boundary.ymin) & (ys <= boundary.ymax))
+        xs, ys = xs[inside], ys[inside]
+        
+        # Morton code: two bits (north, east) per level, from the root down.
+        # Cell centers are updated with the same arithmetic as subdivide
+        codes = np.zeros(len(xs), dtype=np.uint64)
+        cx = np.full(len(xs), float(boundary.x))
+        cy = np.full(len(xs), float(boundary.y))
+        w, h = boundary.width, boundary.height
+        for _ in range(max_depth):
+            w, h = w / 2, h / 2
+            east = xs >= (cx + w) - w
+            north = ys >= (cy + h) - h
+            codes = (codes << np.uint64(2)) | (north * 2 + east).astype(np.uint64)
+            cx = np.where(east, cx + w, cx - w)
+            cy = np.where(north, cy + h, cy - h)
+        
+        order = np.argsort(codes, kind='stable')
+        codes = codes[order].tolist()
+        points = [Point(x, y, data[i]) for x, y, i in
+                  zip(xs[order].tolist(), ys[order].tolist(), inside[order].tolist())]
+        
+        # Digit of each child quadrant in the Morton code
+        quadrant_digits = (('southwest', 0), ('southeast', 1),
+                           ('northwest', 2), ('northeast', 3))
+        
+        def build(node, lo, hi, level, prefix):
+            if hi - lo <= capacity or level == max_depth:
+                node.points = points[lo:hi]
+                return
+            node.subdivide()
+            # Sorted codes keep each quadrant's points contiguous; the
+            # quadrant with digit d starts at code prefix + d * step
+            step = 1 << (2 * (max_depth - level - 1))
+            for name, digit in quadrant_digits:
+                start = lo if digit == 0 else bisect_left(codes, prefix + digit * step, lo, hi)
+                end = hi if digit == 3 else bisect_left(codes, prefix + (digit + 1) * step, start, hi)
+                child = getattr(node, name)
+                build(child, start, end, level + 1, prefix + digit * step)
+                node._node_count += child._node_count - 1
+        
+        root = cls(boundary, capacity, max_depth)
+        build(root, 0, len(points), 0, 0)
+        return root
+    
     def query(self, range_rect, found=None):
         """
         Query all points within a rectangular range (Divide & Conquer).
@@ -132,21 +277,38 @@ class QuadTree:
         if found is None:
             found = []
         
-        # If boundary doesn't intersect range, return empty
-        if not self.boundary.intersects(range_rect):
-            return found
-        
-        # Check points in this node
-        for point in self.points:
-            if range_rect.contains(point):
-                found.append(point)
+        # Range edges as locals: the per-node and per-point tests below are
+        # inlined comparisons rather than Rectangle method calls
+        xmin, xmax = range_rect.xmin, range_rect.xmax
+        ymin, ymax = range_rect.ymin, range_rect.ymax
         
-        # If divided, recursively search quadrants
-        if self.divided:
-            self.northeast.query(range_rect, found)
-            self.northwest.query(range_rect, found)
-            self.southeast.query(range_rect, found)
-            self.southwest.query(range_rect, found)
+        # Walk the tree with an explicit stack instead of recursing per node;
+        # children are pushed in reverse so they are visited NE, NW, SE, SW
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            b = node.boundary
+            
+            # If boundary doesn't intersect range, skip this subtree
+            if xmin > b.xmax or xmax < b.xmin or ymin > b.ymax or ymax < b.ymin:
+                continue
+            
+            # If the range covers this whole node, take every point below it
+            # without testing them one by one
+            if xmin <= b.xmin and b.xmax <= xmax and ymin <= b.ymin and b.ymax <= ymax:
+                found.extend(node.get_all_points())
+                continue
+            
+            # Check points in this node
+            for point in node.points:
+                if xmin <= point.x <= xmax and ymin <= point.y <= ymax:
+                    found.append(point)
+            
+            if node.divided:
+                stack.append(node.southwest)
+                stack.append(node.southeast)
+                stack.append(node.northwest)
+                stack.append(node.northeast)
         
         return found
     
@@ -161,39 +323,68 @@ class QuadTree:
         Returns:
             List of points within radius
         """
-        # Create bounding rectangle for circular area
-        range_rect = Rectangle(center_point.x, center_point.y, radius, radius)
-        candidates = self.query(range_rect)
+        cx = center_point.x
+        cy = center_point.y
+        radius_sq = radius * radius
+        xmin, xmax = cx - radius, cx + radius
+        ymin, ymax = cy - radius, cy + radius
         
-        # Filter to only points actually within circular radius
+        # Walk nodes against the circle itself rather than filtering the
+        # results of a square query: nodes the circle misses are skipped and
+        # nodes it fully covers are taken whole, so only points in nodes on
+        # the circle's edge get a (squared) distance test
         found = []
-        for point in candidates:
-            dx = point.x - center_point.x
-            dy = point.y - center_point.y
-            distance = (dx * dx + dy * dy) ** 0.5
-            if distance <= radius:
-                found.append(point)
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            b = node.boundary
+            
+            bxmin, bxmax, bymin, bymax = b.xmin, b.xmax, b.ymin, b.ymax
+            
+            # Skip nodes outside the circle's bounding square
+            if bxmin > xmax or bxmax < xmin or bymin > ymax or bymax < ymin:
+                continue
+            
+            # Nodes inside the square: take them whole if the farthest corner
+            # is also inside the circle
+            if xmin <= bxmin and bxmax <= xmax and ymin <= bymin and bymax <= ymax:
+                dx = cx - bxmin if cx - bxmin > bxmax - cx else bxmax - cx
+                dy = cy - bymin if cy - bymin > bymax - cy else bymax - cy
+                if dx * dx + dy * dy <= radius_sq:
+                    found.extend(node.get_all_points())
+                    continue
+            
+            for point in node.points:
+                dx = point.x - cx
+                dy = point.y - cy
+                if dx * dx + dy * dy <= radius_sq:
+                    found.append(point)
+            
+            if node.divided:
+                stack.append(node.southwest)
+                stack.append(node.southeast)
+                stack.append(node.northwest)
+                stack.append(node.northeast)
         
         return found
     
     def get_all_points(self):
         """Get all points in the quadtree."""
-        all_points = list(self.points)
+        all_points = []
         
-        if self.divided:
-            all_points.extend(self.northeast.get_all_points())
-            all_points.extend(self.northwest.get_all_points())
-            all_points.extend(self.southeast.get_all_points())
-            all_points.extend(self.southwest.get_all_points())
+        # Same NE, NW, SE, SW order as the recursive form, without a call per node
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            all_points.extend(node.points)
+            if node.divided:
+                stack.append(node.southwest)
+                stack.append(node.southeast)
+                stack.append(node.northwest)
+                stack.append(node.northeast)
         
         return all_points
     
     def count_nodes(self):
-        """Count total number of nodes in the tree."""
-        count = 1
-        if self.divided:
-            count += self.northeast.count_nodes()
-            count += self.northwest.count_nodes()
-            count += self.southeast.count_nodes()
-            count += self.southwest.count_nodes()
-        return count
+        """Count total number of nodes in the tree (maintained on insert, O(1))."""
+        return self._node_count
@@ -11,17 +11,25 @@ Calculates risk scores based on 7 parameters:
 7. Plate Zones
 """
 
+import functools
 import math
+
 import pandas as pd
 import numpy as np
-from sklearn.neighbors import BallTree
+
+from .dataio import read_csv_cached
+
+# Module-level constants for the distance hot paths: a plain float global
+# is cheaper to load than a class attribute or a math.radians call
+_EARTH_RADIUS_KM = 6371.0
+_D2R = math.pi / 180.0
 
 
 class RiskCalculator:
     """Calculate earthquake risk scores based on multiple parameters."""
     
     # Earth's mean radius in kilometers (for haversine distance calculations)
-    EARTH_RADIUS_KM = 6371.0
+    EARTH_RADIUS_KM = _EARTH_RADIUS_KM
 
     # Risk weights for each parameter (total = 1.0)
     WEIGHTS = {
@@ -35,6 +43,57 @@ class RiskCalculator:
         'population_density': 0.10  # Population density (people per km²)
     }
     
+    # Weights as a vector in feature order, for scoring many rows with one
+    # matrix-vector product
+    WEIGHT_KEYS = ('magnitude', 'depth', 'intensity', 'frequency', 'fault_distance',
+                   'volcano_distance', 'plate_zone', 'population_density')
+    WEIGHTS_ARR = np.array(list(map(WEIGHTS.get, WEIGHT_KEYS)))
+    # Same weights as plain floats, unpacked once per scalar score
+    WEIGHT_VALUES = tuple(map(WEIGHTS.get, WEIGHT_KEYS))
+    
+    # Per-column aggregations for calculate_regional_risk_aggregation
+    REGIONAL_AGG_SPECS = {
+        'mean': {
+            'risk_score': 'mean',
+            'magnitude': 'mean',
+            'depth': 'mean',
+            'latitude': 'mean',
+            'longitude': 'mean',
+            'plate_zone': 'mean',
+            'province': 'first',
+            'type': 'first'
+        },
+        'max': {
+            'risk_score': 'max',
+            'magnitude': 'max',
+            'depth': 'min',  # Shallowest depth = highest risk
+            'latitude': 'mean',
+            'longitude': 'mean',
+            'plate_zone': 'max',
+            'province': 'first',
+            'type': 'first'
+        },
+        'min': {
+            'risk_score': 'min',
+            'magnitude': 'min',
+            'depth': 'max',  # Deepest depth = lowest risk
+            'latitude': 'mean',
+            'longitude': 'mean',
+            'plate_zone': 'min',
+            'province': 'first',
+            'type': 'first'
+        },
+        'count': {
+            'risk_score': 'count',
+            'province': 'first',
+            'type': 'first'
+        }
+    }
+    
+    # Risk level bins: lower score bound of each level above 'Very Low'
+    RISK_THRESHOLDS = np.array([20.0, 40.0, 60.0, 80.0])
+    RISK_LEVELS = np.array(['Very Low', 'Low', 'Moderate', 'High', 'Very High'])
+    
     @staticmethod
     def normalize_magnitude(magnitude):
         """
@@ -52,10 +111,8 @@ class RiskCalculator:
         """
         # Shallow = high risk, deep = low risk
         # Inverse relationship: shallow (0-10km) = 1.0, deep (>300km) = 0.0
-        if depth <= 0:
-            return 1.0
-        normalized = max(0, 1.0 - (depth / 300.0))
-        return normalized
+        # (depth <= 0 gives 1 - depth/300 >= 1, which the clamp maps to 1.0)
+        return max(0.0, min(1.0, 1.0 - depth / 300.0))
     
     @staticmethod
     def normalize_intensity(intensity):
@@ -64,9 +121,7 @@ class RiskCalculator:
         Modified Mercalli Intensity (MMI) scale: I-XII
         """
         # Scale: 1-12, normalize to 0-1
-        if intensity < 1:
-            return 0.0
-        return min((intensity - 1) / 11.0, 1.0)
+        return max(0.0, min(1.0, (intensity - 1) / 11.0))
     
     @staticmethod
     def normalize_frequency(frequency):
@@ -85,10 +140,7 @@ class RiskCalculator:
         Closer to fault = higher risk.
         """
         # Inverse relationship: near (0-10km) = 1.0, far (>200km) = 0.0
-        if distance <= 0:
-            return 1.0
-        normalized = max(0, 1.0 - (distance / 200.0))
-        return normalized
+        return max(0.0, min(1.0, 1.0 - distance / 200.0))
     
     @staticmethod
     def normalize_volcano_distance(distance):
@@ -97,10 +149,7 @@ class RiskCalculator:
         Closer to volcano = higher risk (volcanic earthquakes).
         """
         # Inverse relationship: near (0-10km) = 1.0, far (>150km) = 0.0
-        if distance <= 0:
-            return 1.0
-        normalized = max(0, 1.0 - (distance / 150.0))
-        return normalized
+        return max(0.0, min(1.0, 1.0 - distance / 150.0))
     
 
     @staticmethod
@@ -126,6 +175,55 @@ class RiskCalculator:
         # Assume max density of 100,000 people/km² for normalization
         return min(density / 100000.0, 1.0)
     
+    # Array counterparts of the normalize_* methods. Each applies the same
+    # clamp elementwise to a NumPy array (or anything np.asarray accepts) and
+    # keeps the input's float dtype, so float32 columns stay float32.
+    
+    @staticmethod
+    def normalize_magnitude_vec(magnitude):
+        """Vectorized normalize_magnitude."""
+        return np.minimum(np.asarray(magnitude) / 9.0, 1.0)
+    
+    @staticmethod
+    def normalize_depth_vec(depth):
+        """Vectorized normalize_depth."""
+        return np.clip(1.0 - np.asarray(depth) / 300.0, 0.0, 1.0)
+    
+    @staticmethod
+    def normalize_intensity_vec(intensity):
+        """Vectorized normalize_intensity."""
+        return np.clip((np.asarray(intensity) - 1) / 11.0, 0.0, 1.0)
+    
+    @staticmethod
+    def normalize_frequency_vec(frequency):
+        """Vectorized normalize_frequency."""
+        return np.minimum(np.asarray(frequency) / 50.0, 1.0)
+    
+    @staticmethod
+    def normalize_fault_distance_vec(distance):
+        """Vectorized normalize_fault_distance."""
+        return np.clip(1.0 - np.asarray(distance) / 200.0, 0.0, 1.0)
+    
+    @staticmethod
+    def normalize_volcano_distance_vec(distance):
+        """Vectorized normalize_volcano_distance."""
+        return np.clip(1.0 - np.asarray(distance) / 150.0, 0.0, 1.0)
+    
+    @staticmethod
+    def normalize_plate_zone_vec(zone_type):
+        """Vectorized normalize_plate_zone (unknown zones map to 0.5)."""
+        zone_type = np.asarray(zone_type)
+        return np.select(
+            [zone_type == 0, zone_type == 1, zone_type == 2],
+            [0.1, 0.6, 1.0],
+            default=0.5
+        )
+    
+    @staticmethod
+    def normalize_population_density_vec(density):
+        """Vectorized normalize_population_density."""
+        return np.minimum(np.asarray(density) / 100000.0, 1.0)
+    
 
     @classmethod
     def calculate_risk_score(cls, magnitude, depth, intensity, frequency,
@@ -163,20 +261,87 @@ class RiskCalculator:
             norm_population = 0.0  # Default to no population risk if not provided
         
         # Calculate weighted score
+        w_mag, w_depth, w_int, w_freq, w_fault, w_volc, w_plate, w_pop = cls.WEIGHT_VALUES
         risk_score = (
-            cls.WEIGHTS['magnitude'] * norm_magnitude +
-            cls.WEIGHTS['depth'] * norm_depth +
-            cls.WEIGHTS['intensity'] * norm_intensity +
-            cls.WEIGHTS['frequency'] * norm_frequency +
-            cls.WEIGHTS['fault_distance'] * norm_fault +
-            cls.WEIGHTS['volcano_distance'] * norm_volcano +
-            cls.WEIGHTS['plate_zone'] * norm_plate +
-            cls.WEIGHTS['population_density'] * norm_population
+            w_mag * norm_magnitude +
+            w_depth * norm_depth +
+            w_int * norm_intensity +
+            w_freq * norm_frequency +
+            w_fault * norm_fault +
+            w_volc * norm_volcano +
+            w_plate * norm_plate +
+            w_pop * norm_population
         )
         
         # Scale to 0-100
         return risk_score * 100
     
+    @classmethod
+    def calculate_risk_score_vec(cls, magnitude, depth, intensity, frequency,
+                                 fault_distance, volcano_distance, plate_zone,
+                                 population_density=None, dtype=np.float64):
+        """
+        Vectorized counterpart of calculate_risk_score.
+        
+        Applies every normalization elementwise and sums the weighted terms
+        over whole NumPy arrays, so a DataFrame is scored in one pass instead
+        of one Python call per row.
+        
+        Args:
+            magnitude: Array of earthquake magnitudes (Richter scale)
+            depth: Array of depths in km
+            intensity: Array of MMI intensities (1-12)
+            frequency: Array of events per year
+            fault_distance: Array of distances to nearest fault (km)
+            volcano_distance: Array of distances to nearest volcano (km)
+            plate_zone: Array of zone types (0=stable, 1=boundary, 2=subduction)
+            population_density: Optional array of population densities (people per km²)
+            dtype: Float type for the computation. np.float32 halves memory
+                traffic and keeps scores within about 1e-4 of float64; float32
+                inputs (such as downcast DataFrame columns) are then used
+                without an upcast copy
+            
+        Returns:
+            numpy.ndarray of risk scores (0-100)
+        """
+        magnitude = np.asarray(magnitude, dtype=dtype)
+        depth = np.asarray(depth, dtype=dtype)
+        intensity = np.asarray(intensity, dtype=dtype)
+        frequency = np.asarray(frequency, dtype=dtype)
+        fault_distance = np.asarray(fault_distance, dtype=dtype)
+        volcano_distance = np.asarray(volcano_distance, dtype=dtype)
+        plate_zone = np.asarray(plate_zone)
+        
+        # Same normalizations as the scalar normalize_* methods, each a single
+        # clamp with no masked select
+        norm_magnitude = cls.normalize_magnitude_vec(magnitude)
+        norm_depth = cls.normalize_depth_vec(depth)
+        norm_intensity = cls.normalize_intensity_vec(intensity)
+        norm_frequency = cls.normalize_frequency_vec(frequency)
+        norm_fault = cls.normalize_fault_distance_vec(fault_distance)
+        norm_volcano = cls.normalize_volcano_distance_vec(volcano_distance)
+        norm_plate = cls.normalize_plate_zone_vec(plate_zone).astype(dtype, copy=False)
+        
+        # Normalize population density if provided
+        if population_density is not None:
+            norm_population = cls.normalize_population_density_vec(
+                np.asarray(population_density, dtype=dtype))
+        else:
+            # Default to no population risk if not provided
+            norm_population = np.zeros(norm_magnitude.shape, dtype=dtype)
+        
+        # Weighted score: one (..., 8) feature stack times the weight vector.
+        # Broadcasting the terms first keeps scalar/array mixes working, and
+        # all-scalar input stays a scalar
+        features = np.stack(np.broadcast_arrays(
+            norm_magnitude, norm_depth, norm_intensity, norm_frequency,
+            norm_fault, norm_volcano, norm_plate, norm_population
+        ), axis=-1)
+        risk_score = features @ cls.WEIGHTS_ARR.astype(dtype, copy=False)
+        
+        # Scale to 0-100
+        return risk_score * 100
+    
 
     @staticmethod
     def load_jawa_regions_data(filepath):
@@ -190,13 +355,29 @@ class RiskCalculator:
             DataFrame with regional data
         """
         try:
-            df = pd.read_csv(filepath)
+            df = read_csv_cached(filepath)
             print(f"Loaded {len(df)} regions from {filepath}")
             return df
         except Exception as e:
             print(f"Error loading regions data: {e}")
             return None
     
+    @staticmethod
+    def _merge_regions(earthquake_df, regions_df, region_cols):
+        """Left-join region_cols from regions_df onto earthquake_df by region_name."""
+        return earthquake_df.merge(
+            regions_df[['region_name', *region_cols]], 
+            on='region_name', 
+            how='left'
+        )
+    
+    @staticmethod
+    def _ensure_categorical(df, cols):
+        """Return df with cols cast to category, copying only if a cast is needed."""
+        casts = {col: 'category' for col in cols
+                 if not isinstance(df[col].dtype, pd.CategoricalDtype)}
+        return df.astype(casts) if casts else df
+    
     @classmethod
     def calculate_regional_risk_aggregation(cls, earthquake_df, regions_df, 
                                            aggregation_type='mean'):
@@ -214,46 +395,75 @@ class RiskCalculator:
         if regions_df is None:
             return earthquake_df
         
-        # Merge earthquake data with regions based on region_name
-        merged_df = earthquake_df.merge(
-            regions_df[['region_name', 'province', 'type']], 
-            on='region_name', 
-            how='left'
-        )
+        if aggregation_type not in cls.REGIONAL_AGG_SPECS:
+            raise ValueError(f"Unknown aggregation_type: {aggregation_type}")
+        agg_spec = cls.REGIONAL_AGG_SPECS[aggregation_type]
+        
+        # Merge earthquake data with regions based on region_name, carrying
+        # only the columns the aggregation reads
+        quake_cols = ['region_name'] + [col for col in agg_spec if col not in ('province', 'type')]
+        merged_df = cls._merge_regions(earthquake_df[quake_cols], regions_df, ['province', 'type'])
+        
+        return cls._regional_stats_from_merged(merged_df, aggregation_type)
+    
+    @classmethod
+    def _regional_stats_from_merged(cls, merged_df, aggregation_type='mean'):
+        """Aggregate an already region-merged frame by region_name."""
+        agg_spec = cls.REGIONAL_AGG_SPECS[aggregation_type]
         
-        # Calculate regional aggregation
-        if aggregation_type == 'mean':
-            regional_stats = merged_df.groupby('region_name').agg({
-                'risk_score': 'mean',
-                'magnitude': 'mean',
-                'depth': 'mean',
-                'latitude': 'mean',
-                'longitude': 'mean',
-                'plate_zone': 'mean',
-                'province': 'first',
-                'type': 'first'
-            }).reset_index()
-        elif aggregation_type == 'max':
-            regional_stats = merged_df.groupby('region_name').agg({
-                'risk_score': 'max',
-                'magnitude': 'max',
-                'depth': 'min',  # Shallowest depth = highest risk
-                'latitude': 'mean',
-                'longitude': 'mean',
-                'plate_zone': 'max',
-                'province': 'first',
-                'type': 'first'
-            }).reset_index()
-        elif aggregation_type == 'count':
-            regional_stats = merged_df.groupby('region_name').agg({
-                'risk_score': 'count',
-                'province': 'first',
-                'type': 'first'
-            }).reset_index()
+        # Factorize region names into integer codes, sorted so regions come out
+        # in groupby order; rows without a region (code -1) are dropped, as
+        # groupby drops missing keys
+        codes, regions = pd.factorize(merged_df['region_name'], sort=True)
+        rows = np.flatnonzero(codes >= 0)
+        codes = codes[rows]
+        n_regions = len(regions)
+        
+        # Calculate regional aggregation per column. Like groupby, every
+        # reduction skips missing values: counts and sums via bincount over
+        # the non-null rows, extremes via fmax/fmin (which ignore NaN), and
+        # 'first' takes each region's first non-null value
+        columns = {'region_name': np.asarray(regions)}
+        for col, func in agg_spec.items():
+            values = merged_df[col].to_numpy()[rows]
+            valid = pd.notna(values)
+            valid_codes = codes[valid]
+            if func == 'count':
+                columns[col] = np.bincount(valid_codes, minlength=n_regions)
+            elif func == 'first':
+                first = np.full(n_regions, len(rows))
+                np.minimum.at(first, valid_codes, np.flatnonzero(valid))
+                found = first < len(rows)
+                result = np.full(n_regions, np.nan, dtype=object)
+                result[found] = values[first[found]]
+                columns[col] = result
+            elif func == 'mean':
+                sums = np.bincount(valid_codes, weights=values[valid].astype(np.float64),
+                                   minlength=n_regions)
+                counts = np.bincount(valid_codes, minlength=n_regions)
+                columns[col] = np.divide(sums, counts, out=np.full(n_regions, np.nan),
+                                         where=counts > 0)
+            elif valid.all() and values.dtype.kind in 'iub':
+                # Integer columns cannot hold NaN; seed from each region's
+                # first row and keep the column's dtype, as groupby does
+                first = np.full(n_regions, len(rows))
+                np.minimum.at(first, codes, np.arange(len(rows)))
+                extreme = values[first]
+                reduce_ufunc = np.maximum if func == 'max' else np.minimum
+                reduce_ufunc.at(extreme, codes, values)
+                columns[col] = extreme
+            else:
+                extreme = np.full(n_regions, np.nan)
+                reduce_ufunc = np.fmax if func == 'max' else np.fmin
+                reduce_ufunc.at(extreme, valid_codes, values[valid].astype(np.float64))
+                columns[col] = extreme
+        regional_stats = pd.DataFrame(columns)
+        if aggregation_type == 'count':
             regional_stats.rename(columns={'risk_score': 'earthquake_count'}, inplace=True)
         
-        # Add risk level
-        regional_stats['risk_level'] = regional_stats['risk_score'].apply(cls.get_risk_level)
+        # Add risk level ('count' tables carry no risk score to classify)
+        if 'risk_score' in regional_stats:
+            regional_stats['risk_level'] = cls.get_risk_levels(regional_stats['risk_score'])
         
         return regional_stats
     
@@ -272,15 +482,21 @@ class RiskCalculator:
         if regions_df is None:
             return None
         
-        # Merge data
-        merged_df = earthquake_df.merge(
-            regions_df[['region_name', 'province', 'type', 'population_2020']], 
-            on='region_name', 
-            how='left'
+        # Merge data, carrying only the columns the aggregation reads
+        merged_df = cls._merge_regions(
+            earthquake_df[['region_name', 'risk_score', 'magnitude', 'depth', 'frequency']],
+            regions_df, ['province', 'population_2020']
         )
         
-        # Calculate provincial statistics
-        provincial_stats = merged_df.groupby('province').agg({
+        return cls._provincial_stats_from_merged(merged_df)
+    
+    @classmethod
+    def _provincial_stats_from_merged(cls, merged_df):
+        """Aggregate an already region-merged frame by province."""
+        # Calculate provincial statistics, grouping on category codes
+        province_dtype = merged_df['province'].dtype
+        merged_df = cls._ensure_categorical(merged_df, ['province'])
+        provincial_stats = merged_df.groupby('province', observed=True).agg({
             'risk_score': ['mean', 'max', 'min', 'std'],
             'magnitude': ['mean', 'max'],
             'depth': ['mean', 'min'],
@@ -295,9 +511,11 @@ class RiskCalculator:
             'avg_magnitude', 'max_magnitude', 'avg_depth', 'min_depth',
             'avg_frequency', 'total_population', 'regions_affected'
         ]
+        # Hand provinces back in the caller's dtype, not the grouping category
+        provincial_stats['province'] = provincial_stats['province'].astype(province_dtype)
         
         # Add risk level classification
-        provincial_stats['risk_level'] = provincial_stats['avg_risk_score'].apply(cls.get_risk_level)
+        provincial_stats['risk_level'] = cls.get_risk_levels(provincial_stats['avg_risk_score'])
         
         # Calculate risk per capita (normalize by population)
         provincial_stats['risk_per_100k'] = (
@@ -342,11 +560,15 @@ class RiskCalculator:
         if regions_df is None:
             return None
         
+        # Merge once with every region column the analyses below read
+        merged_df = cls._merge_regions(earthquake_df, regions_df,
+                                       ['province', 'type', 'population_2020'])
+        
         # Regional statistics
-        regional_stats = cls.calculate_regional_risk_aggregation(earthquake_df, regions_df)
+        regional_stats = cls._regional_stats_from_merged(merged_df)
         
         # Provincial statistics
-        provincial_stats = cls.calculate_provincial_risk_analysis(earthquake_df, regions_df)
+        provincial_stats = cls._provincial_stats_from_merged(merged_df)
         
         # High risk regions
         high_risk_regions = cls.get_high_risk_regions(regional_stats, top_n=10)
@@ -358,7 +580,7 @@ class RiskCalculator:
             province_ranking = None
         
         # Risk level distribution by province
-        risk_by_province = cls.get_risk_distribution_by_province(earthquake_df, regions_df)
+        risk_by_province = cls._risk_distribution_from_merged(merged_df)
         
         return {
             'regional_stats': regional_stats,
@@ -384,18 +606,27 @@ class RiskCalculator:
             return None
         
         # Merge data
-        merged_df = earthquake_df.merge(
-            regions_df[['region_name', 'province', 'type']], 
-            on='region_name', 
-            how='left'
-        )
+        merged_df = cls._merge_regions(earthquake_df[['region_name', 'risk_level']],
+                                       regions_df, ['province'])
         
-        # Create crosstab
-        risk_distribution = pd.crosstab(
-            merged_df['province'], 
-            merged_df['risk_level'], 
-            margins=True
-        )
+        return cls._risk_distribution_from_merged(merged_df)
+    
+    @classmethod
+    def _risk_distribution_from_merged(cls, merged_df):
+        """Cross-tabulate province against risk level in a region-merged frame."""
+        # Count province/risk level pairs in one groupby over category codes
+        merged_df = cls._ensure_categorical(merged_df, ['province', 'risk_level'])
+        risk_distribution = (merged_df.groupby(['province', 'risk_level'], observed=True)
+                             .size().unstack(fill_value=0))
+        # unstack does not keep category order; restore crosstab's ordering
+        risk_distribution = risk_distribution.sort_index().sort_index(axis=1)
+        
+        # Add 'All' margins as crosstab(margins=True) would; plain object
+        # labels first, since a categorical axis cannot take the new label
+        risk_distribution.index = risk_distribution.index.astype(object)
+        risk_distribution.columns = risk_distribution.columns.astype(object)
+        risk_distribution['All'] = risk_distribution.sum(axis=1)
+        risk_distribution.loc['All'] = risk_distribution.sum()
         
         return risk_distribution
     
@@ -423,10 +654,13 @@ class RiskCalculator:
             summary.append("\nTOP 10 HIGHEST RISK REGIONS:")
             summary.append("-" * 40)
             top_regions = regional_analysis['high_risk_regions']
-            for idx, row in top_regions.iterrows():
+            for name, province, score, level in zip(top_regions['region_name'].to_numpy(),
+                                                    top_regions['province'].to_numpy(),
+                                                    top_regions['risk_score'].to_numpy(),
+                                                    top_regions['risk_level'].to_numpy()):
                 summary.append(
-                    f"{row['region_name']} ({row['province']}): "
-                    f"Risk Score {row['risk_score']:.2f} ({row['risk_level']})"
+                    f"{name} ({province}): "
+                    f"Risk Score {score:.2f} ({level})"
                 )
         
         # Provincial ranking
@@ -434,11 +668,16 @@ class RiskCalculator:
             summary.append("\nPROVINCIAL RISK RANKING:")
             summary.append("-" * 30)
             provinces = regional_analysis['province_ranking']
-            for idx, row in provinces.iterrows():
+            for idx, province, avg_score, level, regions in zip(
+                    provinces.index.to_numpy(),
+                    provinces['province'].to_numpy(),
+                    provinces['avg_risk_score'].to_numpy(),
+                    provinces['risk_level'].to_numpy(),
+                    provinces['regions_affected'].to_numpy()):
                 summary.append(
-                    f"{idx+1}. {row['province']}: "
-                    f"Avg Risk {row['avg_risk_score']:.2f} ({row['risk_level']}), "
-                    f"{row['regions_affected']} regions affected"
+                    f"{idx+1}. {province}: "
+                    f"Avg Risk {avg_score:.2f} ({level}), "
+                    f"{regions} regions affected"
                 )
         
         # Risk distribution
@@ -472,72 +711,233 @@ class RiskCalculator:
             return "Very Low"
     
 
-    @staticmethod
-    def haversine_distance(lat1, lon1, lat2, lon2):
+    @classmethod
+    def get_risk_codes(cls, scores):
+        """
+        Get integer risk level codes for an array of scores.
+        
+        Codes index into RISK_LEVELS (0='Very Low' ... 4='Very High') and are
+        computed with one np.searchsorted call over the level thresholds.
+        
+        Args:
+            scores: Array-like of risk scores (0-100)
+            
+        Returns:
+            numpy.ndarray of integer codes (0-4)
+        """
+        scores = np.asarray(scores, dtype=float)
+        codes = np.searchsorted(cls.RISK_THRESHOLDS, scores, side='right')
+        codes[np.isnan(scores)] = 0  # Match get_risk_level for missing scores
+        return codes
+    
+    @classmethod
+    def get_risk_levels(cls, scores):
+        """
+        Get risk level categories for an array of scores.
+        
+        Vectorized counterpart of get_risk_level: bins all scores at once
+        instead of making one Python call per score.
+        
+        Args:
+            scores: Array-like of risk scores (0-100)
+            
+        Returns:
+            numpy.ndarray of risk level strings
+        """
+        return cls.RISK_LEVELS[cls.get_risk_codes(scores)]
+    
+    @classmethod
+    def get_risk_categories(cls, scores):
+        """
+        Get risk levels for an array of scores as an ordered Categorical.
+        
+        Stores one small integer code per score plus the five level names,
+        rather than a Python string per score, so value_counts, equality
+        masks and groupby on the result run on the codes.
+        
+        Args:
+            scores: Array-like of risk scores (0-100)
+            
+        Returns:
+            pandas.Categorical ordered from 'Very Low' to 'Very High'
+        """
+        return pd.Categorical.from_codes(cls.get_risk_codes(scores),
+                                         categories=cls.RISK_LEVELS, ordered=True)
+    
+
+    @classmethod
+    def haversine_distance(cls, lat1, lon1, lat2, lon2):
         """
         Calculate the great circle distance between two points 
         on the earth (specified in decimal degrees) using Haversine formula.
         Returns distance in kilometers.
+        
+        Accepts scalars or NumPy arrays (broadcast elementwise), so a whole
+        column of locations can be measured in one call.
         """
+        # A single pair of plain floats goes through math, which skips
+        # wrapping each value in a 0-d array
+        if all(isinstance(v, (int, float)) for v in (lat1, lon1, lat2, lon2)):
+            lat1, lon1, lat2, lon2 = lat1 * _D2R, lon1 * _D2R, lat2 * _D2R, lon2 * _D2R
+            a = (math.sin((lat2 - lat1) / 2) ** 2
+                 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+            return 2 * math.asin(math.sqrt(a)) * cls.EARTH_RADIUS_KM
+        
         # Convert decimal degrees to radians
-        lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
+        lat1, lon1, lat2, lon2 = map(np.radians, [lat1, lon1, lat2, lon2])
         
         # Haversine formula
         dlat = lat2 - lat1
         dlon = lon2 - lon1
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
+        a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
+        c = 2 * np.arcsin(np.sqrt(a))
         
-        # Radius of earth in kilometers
-        r = 6371
-        return c * r
+        return c * cls.EARTH_RADIUS_KM
     
     @staticmethod
     def calculate_distance(x1, y1, x2, y2):
-        """Calculate Euclidean distance between two points."""
-        return math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
+        """
+        Calculate Euclidean distance between two points.
+        Accepts scalars or NumPy arrays (broadcast elementwise).
+        """
+        return np.hypot(x2 - x1, y2 - y1)
     
     @staticmethod
-    def build_spatial_tree(dataframe):
+    def calculate_distance_sq(x1, y1, x2, y2):
+        """
+        Calculate squared Euclidean distance between two points.
+        Use for radius checks against radius * radius to skip the square root.
+        """
+        dx = x2 - x1
+        dy = y2 - y1
+        return dx * dx + dy * dy
+    
+    @staticmethod
+    def unit_vectors(lats, lons):
+        """
+        Project latitude/longitude (degrees) onto the unit sphere.
+        
+        Returns an (N, 3) array of x, y, z coordinates. The straight-line
+        (chord) distance between two such points increases monotonically
+        with their great-circle distance, so a Euclidean nearest-neighbour
+        search on them finds the geodesically nearest point.
+        """
+        lat_rad = np.asarray(lats, dtype=np.float64) * _D2R
+        lon_rad = np.asarray(lons, dtype=np.float64) * _D2R
+        cos_lat = np.cos(lat_rad)
+        return np.column_stack([cos_lat * np.cos(lon_rad),
+                                cos_lat * np.sin(lon_rad),
+                                np.sin(lat_rad)])
+    
+    @classmethod
+    def chord_to_km(cls, chord):
+        """Convert unit-sphere chord length(s) to great-circle distance in km."""
+        return 2 * cls.EARTH_RADIUS_KM * np.arcsin(np.minimum(chord / 2, 1.0))
+    
+    @classmethod
+    def build_spatial_tree(cls, dataframe, leaf_size=16):
         """
-        Build a BallTree spatial index from a dataframe containing 'latitude' and 'longitude'.
+        Build a spatial index from a dataframe containing 'latitude' and 'longitude'.
         
-        Uses BallTree with haversine metric for accurate geodesic distance calculations.
-        The haversine metric accounts for Earth's curvature and provides accurate distances
-        between geographic coordinates.
+        Points are projected once onto the unit sphere (see unit_vectors) and
+        indexed with a scipy cKDTree. Nearest-neighbour queries then compare
+        plain Euclidean chord lengths instead of evaluating the haversine
+        formula at every tree node, and chord_to_km turns the nearest chord
+        back into an exact great-circle distance.
         
         Args:
             dataframe: pandas DataFrame with 'latitude' and 'longitude' columns
+            leaf_size: Maximum points per leaf node. Smaller leaves mean a deeper
+                tree with more build work; 16 (scipy's default) suits the
+                single-nearest-neighbour queries used here
             
         Returns:
-            sklearn.neighbors.BallTree object, or None if dataframe is empty/None
+            scipy.spatial.cKDTree over unit-sphere coordinates, or None if
+            dataframe is empty/None
             
         Example:
             >>> faults_df = pd.DataFrame({'latitude': [-7.0, -7.5], 'longitude': [110.0, 110.5]})
             >>> tree = RiskCalculator.build_spatial_tree(faults_df)
-            >>> # Use tree.query() to find nearest points
+            >>> # Use find_nearest_fault_distance(s) to query it
         """
         if dataframe is None or dataframe.empty:
             return None
-        # Extract coordinates and convert to radians for haversine metric
-        # BallTree expects (lat, lon) in radians for haversine distance
-        coordinates = dataframe[['latitude', 'longitude']].values
-        coordinates_rad = np.radians(coordinates)
-        return BallTree(coordinates_rad, metric='haversine')
+        return cls._tree_from_coordinates(dataframe['latitude'].to_numpy(),
+                                          dataframe['longitude'].to_numpy(),
+                                          leaf_size)
+    
+    @classmethod
+    def _tree_from_coordinates(cls, lats, lons, leaf_size):
+        """Build a unit-sphere cKDTree from latitude/longitude sequences."""
+        # Imported here so the None/empty guards never load scipy.spatial
+        from scipy.spatial import cKDTree
+        return cKDTree(cls.unit_vectors(lats, lons), leafsize=leaf_size)
+    
+    @staticmethod
+    def build_spatial_tree_cached(dataframe, leaf_size=16):
+        """
+        Cached variant of build_spatial_tree.
+        
+        Trees are memoized on the frame's coordinate values, so frames with
+        the same points share one tree instead of rebuilding it. The returned
+        tree is shared between callers and must not be modified.
+        
+        Args:
+            dataframe: pandas DataFrame with 'latitude' and 'longitude' columns
+            leaf_size: Maximum points per leaf node (see build_spatial_tree)
+            
+        Returns:
+            scipy.spatial.cKDTree, or None if dataframe is empty/None
+        """
+        if dataframe is None or dataframe.empty:
+            return None
+        return _cached_spatial_tree(tuple(dataframe['latitude'].tolist()),
+                                    tuple(dataframe['longitude'].tolist()),
+                                    leaf_size)
 
+    @classmethod
+    def find_nearest_distance(cls, lat, lon, tree, default_km):
+        """
+        Find the distance to the nearest indexed point for one location.
+        
+        Shared implementation of the scalar find_nearest_*_distance methods.
+        
+        Args:
+            lat (float): Latitude of the location (degrees, -90 to 90)
+            lon (float): Longitude of the location (degrees, -180 to 180)
+            tree: Tree from build_spatial_tree, or None
+            default_km: Distance returned when tree is None
+            
+        Returns:
+            float: Distance in kilometers to the nearest indexed point
+        """
+        if tree is None:
+            return float(default_km)
+        
+        # Project the query point with math on the two floats, which avoids
+        # building temporary arrays for a single point
+        lat_rad, lon_rad = lat * _D2R, lon * _D2R
+        cos_lat = math.cos(lat_rad)
+        query_point = (cos_lat * math.cos(lon_rad), cos_lat * math.sin(lon_rad), math.sin(lat_rad))
+        
+        # cKDTree.query returns (chord, index) for a single point
+        chord, _ = tree.query(query_point, k=1)
+        return float(cls.chord_to_km(chord))
+    
     @classmethod
     def find_nearest_fault_distance(cls, lat, lon, faults_tree):
         """
-        Find distance to nearest fault line using BallTree spatial query with haversine metric.
+        Find distance to nearest fault line using a spatial tree query.
         
-        This method uses the haversine formula via BallTree to calculate accurate geodesic
-        distances on Earth's surface, accounting for the planet's curvature. This is more
-        accurate than simple Euclidean approximation, especially for longer distances.
+        The tree is searched by chord length on the unit sphere and the result
+        is converted to great-circle (haversine) distance, accounting for the
+        planet's curvature. This is more accurate than simple Euclidean
+        approximation on degrees, especially for longer distances.
         
         Args:
             lat (float): Latitude of the earthquake location (degrees, -90 to 90)
             lon (float): Longitude of the earthquake location (degrees, -180 to 180)
-            faults_tree: Pre-built sklearn.neighbors.BallTree object with haversine metric
+            faults_tree: Tree from build_spatial_tree
             
         Returns:
             float: Distance in kilometers to nearest fault line
@@ -546,32 +946,22 @@ class RiskCalculator:
             >>> distance = RiskCalculator.find_nearest_fault_distance(-7.0, 110.0, faults_tree)
             >>> print(f"Distance to fault: {distance:.2f} km")
         """
-        if faults_tree is None:
-            return 200.0  # Default max distance
-        
-        # Convert query point to radians for haversine metric
-        query_point = np.radians([[lat, lon]])
-        
-        # BallTree.query returns (distances, indices)
-        # Distance is in radians; convert to kilometers using Earth's radius
-        dist_rad, _ = faults_tree.query(query_point, k=1)
-        dist_km = dist_rad[0][0] * cls.EARTH_RADIUS_KM
-        
-        return dist_km
+        return cls.find_nearest_distance(lat, lon, faults_tree, 200.0)
     
     @classmethod
     def find_nearest_volcano_distance(cls, lat, lon, volcanoes_tree):
         """
-        Find distance to nearest volcano using BallTree spatial query with haversine metric.
+        Find distance to nearest volcano using a spatial tree query.
         
-        This method uses the haversine formula via BallTree to calculate accurate geodesic
-        distances on Earth's surface, accounting for the planet's curvature. This is more
-        accurate than simple Euclidean approximation, especially for longer distances.
+        The tree is searched by chord length on the unit sphere and the result
+        is converted to great-circle (haversine) distance, accounting for the
+        planet's curvature. This is more accurate than simple Euclidean
+        approximation on degrees, especially for longer distances.
         
         Args:
             lat (float): Latitude of the earthquake location (degrees, -90 to 90)
             lon (float): Longitude of the earthquake location (degrees, -180 to 180)
-            volcanoes_tree: Pre-built sklearn.neighbors.BallTree object with haversine metric
+            volcanoes_tree: Tree from build_spatial_tree
             
         Returns:
             float: Distance in kilometers to nearest volcano
@@ -580,19 +970,68 @@ class RiskCalculator:
             >>> distance = RiskCalculator.find_nearest_volcano_distance(-7.0, 110.0, volcanoes_tree)
             >>> print(f"Distance to volcano: {distance:.2f} km")
         """
-        if volcanoes_tree is None:
-            return 150.0  # Default max distance
-        
-        # Convert query point to radians for haversine metric
-        query_point = np.radians([[lat, lon]])
-        
-        # BallTree.query returns (distances, indices)
-        # Distance is in radians; convert to kilometers using Earth's radius
-        dist_rad, _ = volcanoes_tree.query(query_point, k=1)
-        dist_km = dist_rad[0][0] * cls.EARTH_RADIUS_KM
-        
-        return dist_km
-    
+        return cls.find_nearest_distance(lat, lon, volcanoes_tree, 150.0)
+
+    @classmethod
+    def find_nearest_distances_batch(cls, lats, lons, tree, default_km):
+        """
+        Find distances to the nearest indexed point for many locations at once.
+
+        Shared implementation of the batched find_nearest_*_distances methods:
+        every location is projected in one call and sent to the tree in a
+        single query.
+
+        Args:
+            lats: Array-like of latitudes (degrees)
+            lons: Array-like of longitudes (degrees)
+            tree: Tree from build_spatial_tree, or None
+            default_km: Distance returned for every location when tree is None
+
+        Returns:
+            numpy.ndarray: Distances in kilometers to the nearest indexed point
+        """
+        if tree is None:
+            return np.full(len(lats), float(default_km))
+
+        chord, _ = tree.query(cls.unit_vectors(lats, lons), k=1)
+        return cls.chord_to_km(chord)
+
+    @classmethod
+    def find_nearest_fault_distances(cls, lats, lons, faults_tree):
+        """
+        Find distances to the nearest fault line for many locations at once.
+
+        Batched counterpart of find_nearest_fault_distance: all points are sent
+        to the tree in a single query instead of one query per location.
+
+        Args:
+            lats: Array-like of latitudes (degrees)
+            lons: Array-like of longitudes (degrees)
+            faults_tree: Tree from build_spatial_tree
+
+        Returns:
+            numpy.ndarray: Distances in kilometers to the nearest fault line
+        """
+        return cls.find_nearest_distances_batch(lats, lons, faults_tree, 200.0)
+
+    @classmethod
+    def find_nearest_volcano_distances(cls, lats, lons, volcanoes_tree):
+        """
+        Find distances to the nearest volcano for many locations at once.
+
+        Batched counterpart of find_nearest_volcano_distance: all points are sent
+        to the tree in a single query instead of one query per location.
+
+        Args:
+            lats: Array-like of latitudes (degrees)
+            lons: Array-like of longitudes (degrees)
+            volcanoes_tree: Tree from build_spatial_tree
+
+        Returns:
+            numpy.ndarray: Distances in kilometers to the nearest volcano
+        """
+        return cls.find_nearest_distances_batch(lats, lons, volcanoes_tree, 150.0)
+
     @classmethod
     def calculate_enhanced_risk_score(cls, magnitude, depth, intensity, frequency,
                                     lat, lon, faults_tree=None, volcanoes_tree=None,
@@ -609,14 +1048,14 @@ class RiskCalculator:
             frequency: Events per year
             lat: Latitude for distance calculations
             lon: Longitude for distance calculations
-            faults_tree: BallTree object for faults (with haversine metric)
-            volcanoes_tree: BallTree object for volcanoes (with haversine metric)
+            faults_tree: Spatial tree for faults (from build_spatial_tree)
+            volcanoes_tree: Spatial tree for volcanoes (from build_spatial_tree)
             plate_zone: Zone type (0=stable, 1=boundary, 2=subduction)
             
         Returns:
             Risk score (0-100)
         """
-        # Calculate actual distances using BallTree with haversine metric
+        # Calculate actual great-circle distances with the spatial trees
         fault_distance = cls.find_nearest_fault_distance(lat, lon, faults_tree)
         volcano_distance = cls.find_nearest_volcano_distance(lat, lon, volcanoes_tree)
         
@@ -630,15 +1069,95 @@ class RiskCalculator:
         norm_plate = cls.normalize_plate_zone(plate_zone)
         
         # Calculate weighted score according to blueprint formula
+        w_mag, w_depth, w_int, w_freq, w_fault, w_volc, w_plate, _ = cls.WEIGHT_VALUES
         risk_score = (
-            cls.WEIGHTS['magnitude'] * norm_magnitude +
-            cls.WEIGHTS['depth'] * norm_depth +
-            cls.WEIGHTS['intensity'] * norm_intensity +
-            cls.WEIGHTS['frequency'] * norm_frequency +
-            cls.WEIGHTS['fault_distance'] * norm_fault +
-            cls.WEIGHTS['volcano_distance'] * norm_volcano +
-            cls.WEIGHTS['plate_zone'] * norm_plate
+            w_mag * norm_magnitude +
+            w_depth * norm_depth +
+            w_int * norm_intensity +
+            w_freq * norm_frequency +
+            w_fault * norm_fault +
+            w_volc * norm_volcano +
+            w_plate * norm_plate
         )
         
         # Scale to 0-100
         return risk_score * 100
+
+    @classmethod
+    def calculate_enhanced_risk_score_vec(cls, magnitude, depth, intensity, frequency,
+                                          fault_distance, volcano_distance, plate_zone,
+                                          dtype=np.float64):
+        """
+        Vectorized counterpart of calculate_enhanced_risk_score.
+        
+        Scores every location in one pass over NumPy arrays. Distances are taken
+        as precomputed arrays (see find_nearest_fault_distances and
+        find_nearest_volcano_distances) so the spatial trees are queried once
+        per dataset instead of once per row.
+        
+        Args:
+            magnitude: Array of earthquake magnitudes (Richter scale)
+            depth: Array of depths in km
+            intensity: Array of MMI intensities (1-12)
+            frequency: Array of events per year
+            fault_distance: Array of distances to nearest fault (km)
+            volcano_distance: Array of distances to nearest volcano (km)
+            plate_zone: Array of zone types (0=stable, 1=boundary, 2=subduction)
+            dtype: Float type for the computation (see calculate_risk_score_vec)
+            
+        Returns:
+            numpy.ndarray of risk scores (0-100)
+        """
+        # The enhanced score is the base score without population density
+        return cls.calculate_risk_score_vec(magnitude, depth, intensity, frequency,
+                                            fault_distance, volcano_distance, plate_zone,
+                                            dtype=dtype)
+    
+    @classmethod
+    def score_dataframe(cls, df, faults_tree=None, volcanoes_tree=None):
+        """
+        Score every earthquake in a DataFrame column by column.
+        
+        Input columns are read once as NumPy arrays, both spatial trees are
+        queried in one batch each, and the scores are computed in a single
+        vectorized pass. Adds 'risk_score', 'risk_level' (ordered Categorical),
+        'fault_distance_km' and 'volcano_distance_km' columns to df.
+        
+        Args:
+            df: DataFrame with latitude, longitude, magnitude, depth, intensity,
+                frequency and plate_zone columns
+            faults_tree: Spatial tree for faults (from build_spatial_tree)
+            volcanoes_tree: Spatial tree for volcanoes (from build_spatial_tree)
+            
+        Returns:
+            The same DataFrame with the score and distance columns added
+        """
+        lats = df['latitude'].to_numpy()
+        lons = df['longitude'].to_numpy()
+        
+        # One batched spatial query per tree instead of one query per row
+        fault_distances = cls.find_nearest_fault_distances(lats, lons, faults_tree)
+        volcano_distances = cls.find_nearest_volcano_distances(lats, lons, volcanoes_tree)
+        
+        risk_scores = cls.calculate_enhanced_risk_score_vec(
+            magnitude=df['magnitude'].to_numpy(),
+            depth=df['depth'].to_numpy(),
+            intensity=df['intensity'].to_numpy(),
+            frequency=df['frequency'].to_numpy(),
+            fault_distance=fault_distances,
+            volcano_distance=volcano_distances,
+            plate_zone=df['plate_zone'].to_numpy()
+        )
+        
+        df['risk_score'] = risk_scores
+        df['risk_level'] = cls.get_risk_categories(risk_scores)
+        df['fault_distance_km'] = fault_distances
+        df['volcano_distance_km'] = volcano_distances
+        
+        return df
+
+
+@functools.lru_cache(maxsize=64)
+def _cached_spatial_tree(lats, lons, leaf_size):
+    """Memoized RiskCalculator._tree_from_coordinates, keyed on coordinate tuples."""
+    return RiskCalculator._tree_from_coordinates(lats, lons, leaf_size)
@@ -2,13 +2,25 @@
 Simple tests to verify the earthquake risk zoning implementation.
 """
 
+import logging
+import os
+import sys
+import traceback
+
+import numpy as np
+import pandas as pd
+
 from src.quadtree import QuadTree, Point, Rectangle
 from src.risk import RiskCalculator
+from src.dataio import read_csv_cached
+
+# Per-test progress messages; shown only when VERBOSE=1
+log = logging.getLogger(__name__)
 
 
 def test_quadtree_basic():
     """Test basic QuadTree operations."""
-    print("Testing QuadTree basic operations...")
+    log.info("Testing QuadTree basic operations...")
     
     # Create a quadtree
     boundary = Rectangle(0, 0, 100, 100)
@@ -36,12 +48,12 @@ def test_quadtree_basic():
     found_radius = qt.query_radius(center, 30)
     assert len(found_radius) >= 3, f"Expected at least 3 points within radius"
     
-    print("✓ QuadTree basic operations passed")
+    log.info("✓ QuadTree basic operations passed")
 
 
 def test_quadtree_subdivision():
     """Test QuadTree subdivision (Divide & Conquer)."""
-    print("Testing QuadTree subdivision...")
+    log.info("Testing QuadTree subdivision...")
     
     boundary = Rectangle(0, 0, 100, 100)
     qt = QuadTree(boundary, capacity=2)
@@ -59,16 +71,117 @@ def test_quadtree_subdivision():
     assert qt.divided, "QuadTree should have subdivided"
     assert qt.count_nodes() > 1, "Should have multiple nodes after subdivision"
     
+    # Cached node count matches a full traversal
+    def walk(node):
+        if not node.divided:
+            return 1
+        return 1 + sum(walk(child) for child in
+                       (node.northeast, node.northwest, node.southeast, node.southwest))
+    assert qt.count_nodes() == walk(qt), "Cached node count should match tree"
+    
     # Verify all points are retrievable
     all_points = qt.get_all_points()
     assert len(all_points) == len(points), "All points should be retrievable"
     
-    print(f"✓ QuadTree subdivision passed (created {qt.count_nodes()} nodes)")
+    # A rejected insert still counts the nodes it created: the last point lies
+    # in the root, but rounding of the grandchildren's edges leaves it outside
+    # all of them after its quadrant subdivides
+    edge = QuadTree(Rectangle(-2.41, 0, 0.7, 0.7), capacity=1)
+    edge.insert(Point(-1.7100000000000002, -0.7))
+    edge.insert(Point(-3.1100000000000003, 0.5))
+    assert not edge.insert(Point(-3.1100000000000003, 0.7)), "Point should be rejected"
+    assert edge.count_nodes() == walk(edge), "Rejected insert should keep the count in sync"
+    
+    # When rounding leaves a midline point outside the chosen child's subtree,
+    # insert falls back to a sibling that contains it
+    midline = QuadTree(Rectangle(1.11, 3.42, 1.84, 0.44), capacity=1)
+    for x, y in [(2.95, 2.98), (0.19, 3.42), (0.19, 3.42)]:
+        assert midline.insert(Point(x, y)), f"Point ({x}, {y}) in bounds should be inserted"
+    assert len(midline.get_all_points()) == 3
+    assert midline.count_nodes() == walk(midline)
+    
+    log.info(f"✓ QuadTree subdivision passed (created {qt.count_nodes()} nodes)")
+
+
+def test_quadtree_max_depth():
+    """Test that co-located points stop subdividing at max_depth."""
+    log.info("Testing QuadTree max depth...")
+    
+    boundary = Rectangle(0, 0, 100, 100)
+    qt = QuadTree(boundary, capacity=2, max_depth=3)
+    
+    # More identical points than capacity can never be separated
+    for i in range(10):
+        assert qt.insert(Point(10, 10, data=i)), "Co-located point should be inserted"
+    
+    assert qt.count_nodes() == 13, f"Expected 3 levels of subdivision, got {qt.count_nodes()} nodes"
+    assert len(qt.get_all_points()) == 10, "All points should be retrievable"
+    assert len(qt.query_radius(Point(10, 10), 1)) == 10, "All points should be found"
+    
+    log.info("✓ QuadTree max depth passed")
+
+
+def test_quadtree_insert_bulk():
+    """Test bulk insertion from coordinate sequences."""
+    log.info("Testing QuadTree bulk insertion...")
+    
+    boundary = Rectangle(0, 0, 100, 100)
+    qt = QuadTree(boundary, capacity=2)
+    
+    xs = [10, 20, 30, -10, -20, 500]
+    ys = [10, 20, 30, -10, -20, 500]
+    payloads = [(i, i * 10.0) for i in range(len(xs))]
+    
+    inserted = qt.insert_bulk(xs, ys, payloads)
+    assert inserted == 5, f"Out-of-bounds point should be rejected, inserted {inserted}"
+    
+    all_points = qt.get_all_points()
+    assert sorted(p.data for p in all_points) == payloads[:5], "Payloads should be kept"
+    
+    # Range covering whole quadrants and partial ones returns the same points
+    found = qt.query(Rectangle(0, 0, 25, 25))
+    assert sorted(p.data for p in found) == [payloads[0], payloads[1], payloads[3], payloads[4]]
+    
+    log.info("✓ QuadTree bulk insertion passed")
+
+
+def test_quadtree_bulk_load():
+    """Test Morton-order bulk loading against incremental insertion."""
+    log.info("Testing QuadTree bulk load...")
+    
+    boundary = Rectangle(0, 0, 100, 100)
+    xs = [10, 20, 30, -10, -20, 0, 0, 55, -75, 500]
+    ys = [10, 20, 30, -10, -20, 0, 40, -5, 60, 500]
+    payloads = list(range(len(xs)))
+    
+    qt = QuadTree.bulk_load(boundary, xs, ys, payloads, capacity=2)
+    assert qt.divided, "Bulk-loaded tree should subdivide past capacity"
+    assert len(qt.get_all_points()) == 9, "Out-of-bounds point should be dropped"
+    
+    reference = QuadTree(boundary, capacity=2)
+    reference.insert_bulk(xs, ys, payloads)
+    for rect in (Rectangle(0, 0, 25, 25), Rectangle(10, 10, 50, 50), Rectangle(-60, 50, 20, 20)):
+        found = sorted(p.data for p in qt.query(rect))
+        expected = sorted(p.data for p in reference.query(rect))
+        assert found == expected, f"Bulk-loaded query mismatch: {found} != {expected}"
+    
+    # Morton codes hold two bits per level in a uint64, so 32 levels is the
+    # deepest bulk_load can build; deeper requests are refused, not truncated
+    deep = QuadTree.bulk_load(boundary, xs, ys, payloads, capacity=1, max_depth=32)
+    assert len(deep.get_all_points()) == 9, "max_depth=32 should still load every point"
+    try:
+        QuadTree.bulk_load(boundary, xs, ys, payloads, capacity=1, max_depth=33)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("bulk_load should reject max_depth > 32")
+    
+    log.info(f"✓ QuadTree bulk load passed (created {qt.count_nodes()} nodes)")
 
 
 def test_risk_calculation():
     """Test risk score calculation."""
-    print("Testing risk calculation...")
+    log.info("Testing risk calculation...")
     
     # Test high risk scenario (shallow, high magnitude, near fault/volcano)
     high_risk = RiskCalculator.calculate_risk_score(
@@ -96,12 +209,12 @@ def test_risk_calculation():
     assert low_risk < 50, f"Low risk scenario should have score < 50, got {low_risk}"
     assert RiskCalculator.get_risk_level(low_risk) in ["Low", "Very Low", "Moderate"]
     
-    print(f"✓ Risk calculation passed (high={high_risk:.2f}, low={low_risk:.2f})")
+    log.info(f"✓ Risk calculation passed (high={high_risk:.2f}, low={low_risk:.2f})")
 
 
 def test_normalization_functions():
     """Test individual normalization functions."""
-    print("Testing normalization functions...")
+    log.info("Testing normalization functions...")
     
     # Test magnitude normalization
     assert RiskCalculator.normalize_magnitude(0) == 0.0
@@ -123,27 +236,306 @@ def test_normalization_functions():
     assert RiskCalculator.normalize_plate_zone(0) < RiskCalculator.normalize_plate_zone(1)
     assert RiskCalculator.normalize_plate_zone(1) < RiskCalculator.normalize_plate_zone(2)
     
-    print("✓ Normalization functions passed")
+    # Vectorized normalizers: the same checks in one call per normalizer
+    m = RiskCalculator.normalize_magnitude_vec(np.array([0, 9]))
+    assert m[0] == 0.0 and 0.9 <= m[1] <= 1.0
+    d = RiskCalculator.normalize_depth_vec(np.array([0, 10, 100]))
+    assert d[0] == 1.0 and d[1] > d[2]
+    i = RiskCalculator.normalize_intensity_vec(np.array([1, 12]))
+    assert 0.0 <= i[0] <= 0.1 and 0.9 <= i[1] <= 1.0
+    f = RiskCalculator.normalize_fault_distance_vec(np.array([0, 10, 100]))
+    assert f[0] == 1.0 and f[1] > f[2]
+    z = RiskCalculator.normalize_plate_zone_vec(np.array([0, 1, 2]))
+    assert z[0] < z[1] < z[2]
+    
+    # Each vectorized normalizer agrees with its scalar counterpart
+    samples = [-50, 0, 1, 5, 9, 12, 60, 150, 250, 200000]
+    for name in ('magnitude', 'depth', 'intensity', 'frequency', 'fault_distance',
+                 'volcano_distance', 'plate_zone', 'population_density'):
+        scalar = getattr(RiskCalculator, f'normalize_{name}')
+        vec = getattr(RiskCalculator, f'normalize_{name}_vec')
+        expected = [scalar(v) for v in samples]
+        assert np.allclose(vec(np.array(samples)), expected), f"normalize_{name}_vec mismatch"
+    
+    log.info("✓ Normalization functions passed")
+
+
+def test_vectorized_risk_score():
+    """Test vectorized risk scores against the scalar versions."""
+    log.info("Testing vectorized risk calculation...")
+    
+    magnitude = [7.5, 3.0, 6.1, 5.0]
+    depth = [5, 100, 0, 350]
+    intensity = [10, 2, 0, 7]
+    frequency = [10, 1, 60, 5]
+    fault_distance = [5, 150, 0, 250]
+    volcano_distance = [5, 150, -1, 200]
+    plate_zone = [2, 0, 1, 3]
+    
+    scores = RiskCalculator.calculate_enhanced_risk_score_vec(
+        magnitude, depth, intensity, frequency,
+        fault_distance, volcano_distance, plate_zone
+    )
+    assert len(scores) == len(magnitude), "Should return one score per location"
+    
+    for i in range(len(magnitude)):
+        # Without population density the scalar score uses the same weighted terms
+        expected = RiskCalculator.calculate_risk_score(
+            magnitude[i], depth[i], intensity[i], frequency[i],
+            fault_distance[i], volcano_distance[i], plate_zone[i]
+        )
+        assert abs(scores[i] - expected) < 1e-9, f"Vector {scores[i]} != scalar {expected}"
+    
+    # Base score with population density matches the scalar version too
+    population_density = [50000, 0, 250000, 1200]
+    scores = RiskCalculator.calculate_risk_score_vec(
+        magnitude, depth, intensity, frequency,
+        fault_distance, volcano_distance, plate_zone, population_density
+    )
+    for i in range(len(magnitude)):
+        expected = RiskCalculator.calculate_risk_score(
+            magnitude[i], depth[i], intensity[i], frequency[i],
+            fault_distance[i], volcano_distance[i], plate_zone[i], population_density[i]
+        )
+        assert abs(scores[i] - expected) < 1e-9, f"Vector {scores[i]} != scalar {expected}"
+    
+    # Single precision stays close to the float64 scores
+    scores32 = RiskCalculator.calculate_risk_score_vec(
+        magnitude, depth, intensity, frequency,
+        fault_distance, volcano_distance, plate_zone, population_density,
+        dtype=np.float32
+    )
+    assert scores32.dtype == np.float32, f"Expected float32 scores, got {scores32.dtype}"
+    assert np.abs(scores32 - scores).max() < 5e-4, "float32 scores drifted from float64"
+    
+    # Scalars broadcast against arrays, and all-scalar input stays a scalar
+    mixed = RiskCalculator.calculate_risk_score_vec(
+        magnitude, 10.0, 5, 3, 20.0, 30.0, 1
+    )
+    assert mixed.shape == (len(magnitude),), f"Expected {len(magnitude)} scores, got shape {mixed.shape}"
+    single = RiskCalculator.calculate_risk_score_vec(magnitude[0], 10.0, 5, 3, 20.0, 30.0, 1)
+    assert np.ndim(single) == 0, f"Expected a scalar, got shape {np.shape(single)}"
+    assert abs(single - mixed[0]) < 1e-9, f"Scalar {single} != broadcast {mixed[0]}"
+    
+    log.info("✓ Vectorized risk calculation passed")
+
+
+def test_score_dataframe():
+    """Test column-wise DataFrame scoring against the vectorized scorer."""
+    log.info("Testing DataFrame scoring...")
+    
+    df = pd.DataFrame({
+        'latitude': [-7.0, -7.5, -8.0],
+        'longitude': [110.0, 110.5, 111.0],
+        'magnitude': [7.5, 3.0, 5.0],
+        'depth': [5, 100, 350],
+        'intensity': [10, 2, 7],
+        'frequency': [10, 1, 5],
+        'plate_zone': [2, 0, 1],
+    })
+    scored = RiskCalculator.score_dataframe(df)
+    
+    # Without trees the default maximum distances are used
+    assert (scored['fault_distance_km'] == 200.0).all()
+    assert (scored['volcano_distance_km'] == 150.0).all()
+    
+    expected = RiskCalculator.calculate_enhanced_risk_score_vec(
+        df['magnitude'], df['depth'], df['intensity'], df['frequency'],
+        [200.0] * 3, [150.0] * 3, df['plate_zone']
+    )
+    assert (abs(scored['risk_score'].to_numpy() - expected) < 1e-9).all()
+    assert list(scored['risk_level']) == list(RiskCalculator.get_risk_levels(expected))
+    
+    log.info("✓ DataFrame scoring passed")
+
+
+def _regional_test_frames():
+    """Earthquake and region frames with missing values and unmatched regions."""
+    # The last earthquake has no region and is the only 'High' one, so that
+    # risk level is a category that never reaches the province tables
+    earthquakes = pd.DataFrame({
+        'region_name': ['A', 'A', 'A', 'B', 'B', 'C', 'D', None],
+        'risk_score': [50.0, 85.0, np.nan, 30.0, 25.0, np.nan, 10.0, 65.0],
+        'magnitude': [5.0, np.nan, 6.0, 4.0, 5.5, np.nan, 3.5, 4.1],
+        'depth': [10.0, 20.0, np.nan, 5.0, 33.0, np.nan, 7.0, 12.0],
+        'latitude': [-7.0, -7.1, -7.2, -6.0, -6.1, -8.0, -6.5, -6.9],
+        'longitude': [110.0, 110.1, 110.2, 106.0, 106.1, 112.0, 107.0, 108.0],
+        'plate_zone': [1, 2, 1, 0, 1, 2, 1, 0],
+        'frequency': [3, 4, 5, 6, 7, 8, 9, 10],
+    })
+    earthquakes['risk_level'] = RiskCalculator.get_risk_levels(earthquakes['risk_score'])
+    regions = pd.DataFrame({
+        'region_name': ['A', 'B', 'C', 'D'],
+        'province': ['Jawa Barat', 'Jawa Barat', np.nan, 'Banten'],
+        'type': ['Kota', 'Kabupaten', 'Kabupaten', 'Kota'],
+        'population_2020': [100000, 250000, 50000, 80000],
+    })
+    return earthquakes, regions
+
+
+def test_regional_aggregation_matches_groupby():
+    """Test regional aggregation against groupby().agg() on data with NaNs."""
+    log.info("Testing regional aggregation with missing values...")
+    earthquakes, regions = _regional_test_frames()
+    merged = earthquakes.merge(regions[['region_name', 'province', 'type']],
+                               on='region_name', how='left')
+    
+    for aggregation_type, spec in RiskCalculator.REGIONAL_AGG_SPECS.items():
+        stats = RiskCalculator.calculate_regional_risk_aggregation(
+            earthquakes, regions, aggregation_type)
+        expected = merged.groupby('region_name').agg(spec).reset_index()
+        if aggregation_type == 'count':
+            expected = expected.rename(columns={'risk_score': 'earthquake_count'})
+        else:
+            levels = RiskCalculator.get_risk_levels(expected['risk_score'])
+            assert list(stats['risk_level']) == list(levels), aggregation_type
+        pd.testing.assert_frame_equal(stats[expected.columns], expected)
+    
+    log.info("✓ Regional aggregation matches groupby")
+
+
+def test_provincial_analysis_matches_groupby():
+    """Test provincial statistics against the plain groupby they replaced."""
+    log.info("Testing provincial risk analysis...")
+    earthquakes, regions = _regional_test_frames()
+    merged = earthquakes.merge(regions[['region_name', 'province', 'population_2020']],
+                               on='region_name', how='left')
+    
+    stats = RiskCalculator.calculate_provincial_risk_analysis(earthquakes, regions)
+    expected = merged.groupby('province').agg({
+        'risk_score': ['mean', 'max', 'min', 'std'],
+        'magnitude': ['mean', 'max'],
+        'depth': ['mean', 'min'],
+        'frequency': 'mean',
+        'population_2020': 'sum',
+        'region_name': 'count'
+    }).reset_index()
+    expected.columns = list(stats.columns[:len(expected.columns)])
+    pd.testing.assert_frame_equal(stats[expected.columns], expected)
+    
+    levels = RiskCalculator.get_risk_levels(expected['avg_risk_score'])
+    assert list(stats['risk_level']) == list(levels)
+    
+    log.info("✓ Provincial risk analysis matches groupby")
+
+
+def test_risk_distribution_matches_crosstab():
+    """Test the province/risk level table, margins included, against crosstab."""
+    log.info("Testing risk distribution by province...")
+    earthquakes, regions = _regional_test_frames()
+    
+    # Plain string levels and ordered categorical levels (as score_dataframe
+    # produces) must both reproduce crosstab(margins=True), label order included
+    categorical = earthquakes.assign(
+        risk_level=RiskCalculator.get_risk_categories(earthquakes['risk_score']))
+    for frame in (earthquakes, categorical):
+        merged = frame.merge(regions[['region_name', 'province']],
+                             on='region_name', how='left')
+        distribution = RiskCalculator.get_risk_distribution_by_province(frame, regions)
+        expected = pd.crosstab(merged['province'], merged['risk_level'], margins=True)
+        assert list(distribution.index) == list(expected.index)
+        assert list(distribution.columns) == list(expected.columns)
+        assert (distribution.to_numpy() == expected.to_numpy()).all()
+    
+    log.info("✓ Risk distribution matches crosstab")
+
+
+def test_summarize_by_region_matches_groupby():
+    """Test main.summarize_by_region against the groupby it replaced."""
+    log.info("Testing summarize_by_region...")
+    from main import summarize_by_region
+    earthquakes, _ = _regional_test_frames()
+    
+    summary = summarize_by_region(earthquakes)
+    expected = earthquakes.groupby('region_name').agg({
+        'risk_score': ['mean', 'count'],
+        'magnitude': 'mean',
+        'latitude': 'mean',
+        'longitude': 'mean'
+    })
+    expected.columns = ['Avg_Risk_Score', 'Earthquake_Count', 'Avg_Magnitude', 'Avg_Lat', 'Avg_Lon']
+    expected = expected.sort_values('Avg_Risk_Score', ascending=False)
+    pd.testing.assert_frame_equal(summary, expected, check_index_type=False)
+    
+    log.info("✓ summarize_by_region matches groupby")
+
+
+def test_vectorized_risk_levels():
+    """Test vectorized risk level bucketing against get_risk_level."""
+    log.info("Testing vectorized risk levels...")
+    
+    scores = [0, 19.99, 20, 39.9, 40, 59.9, 60, 79.9, 80, 100, float('nan')]
+    levels = RiskCalculator.get_risk_levels(scores)
+    expected = [RiskCalculator.get_risk_level(score) for score in scores]
+    assert list(levels) == expected, f"Expected {expected}, got {list(levels)}"
+    
+    categories = RiskCalculator.get_risk_categories(scores)
+    assert list(categories) == expected, f"Expected {expected}, got {list(categories)}"
+    assert categories.ordered, "Risk level categories should be ordered"
+    
+    log.info("✓ Vectorized risk levels passed")
+
+
+def test_read_csv_cached():
+    """Test that parsed CSV files are cached and refreshed when the CSV changes."""
+    log.info("Testing cached CSV loading...")
+    import tempfile
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        csv_path = os.path.join(tmpdir, 'sample.csv')
+        with open(csv_path, 'w') as f:
+            f.write("latitude,longitude\n-7.0,110.0\n")
+        
+        df = read_csv_cached(csv_path)
+        assert len(df) == 1, "Should load CSV rows"
+        assert os.path.exists(os.path.join(tmpdir, 'sample.pkl')), "Cache should be written"
+        assert read_csv_cached(csv_path).equals(df), "Cached frame should match CSV"
+        
+        # Different read_csv arguments must not reuse the plain cache
+        subset = read_csv_cached(csv_path, usecols=['latitude'])
+        assert list(subset.columns) == ['latitude'], "kwargs should bypass the plain cache"
+        assert list(read_csv_cached(csv_path, usecols=['latitude']).columns) == ['latitude']
+        assert list(read_csv_cached(csv_path).columns) == ['latitude', 'longitude']
+        
+        # Newer CSV invalidates the cache
+        with open(csv_path, 'w') as f:
+            f.write("latitude,longitude\n-7.0,110.0\n-8.0,111.0\n")
+        cache_mtime = os.path.getmtime(os.path.join(tmpdir, 'sample.pkl'))
+        os.utime(csv_path, (cache_mtime + 1, cache_mtime + 1))
+        assert len(read_csv_cached(csv_path)) == 2, "Stale cache should be refreshed"
+        
+        # A truncated cache (e.g. from an interrupted run) falls back to the
+        # CSV and is rewritten
+        cache_path = os.path.join(tmpdir, 'sample.pkl')
+        with open(cache_path, 'wb') as f:
+            f.write(b'\x80')
+        csv_mtime = os.path.getmtime(csv_path)
+        os.utime(cache_path, (csv_mtime + 1, csv_mtime + 1))
+        assert len(read_csv_cached(csv_path)) == 2, "Corrupt cache should fall back to CSV"
+        assert len(pd.read_pickle(cache_path)) == 2, "Corrupt cache should be rewritten"
+        assert not [name for name in os.listdir(tmpdir) if name.endswith('.tmp')], \
+            "No temporary cache files should be left behind"
+    
+    log.info("✓ Cached CSV loading passed")
 
 
 def test_performance_characteristics():
     """Test that QuadTree is faster than linear search."""
-    print("Testing performance characteristics...")
+    log.info("Testing performance characteristics...")
     import time
     
     # Create a larger dataset
     boundary = Rectangle(0, 0, 1000, 1000)
     qt = QuadTree(boundary, capacity=4)
     
-    # Insert many points
+    # Insert many points: a 32-column grid generated with NumPy and
+    # inserted in one bulk call
     num_points = 1000
-    points = []
-    for i in range(num_points):
-        x = (i % 32) * 60 - 960
-        y = (i // 32) * 60 - 960
-        point = Point(x, y, data={'id': i})
-        points.append(point)
-        qt.insert(point)
+    idx = np.arange(num_points)
+    xs_arr = (idx % 32) * 60 - 960
+    ys_arr = (idx // 32) * 60 - 960
+    qt.insert_bulk(xs_arr.tolist(), ys_arr.tolist(),
+                   [{'id': i} for i in idx.tolist()])
     
     # QuadTree query
     query_rect = Rectangle(0, 0, 100, 100)
@@ -151,25 +543,35 @@ def test_performance_characteristics():
     qt_results = qt.query(query_rect)
     qt_time = time.perf_counter() - start
     
-    # Linear search
+    # Linear search: vectorized boolean mask over the coordinate arrays
     start = time.perf_counter()
-    linear_results = [p for p in points if query_rect.contains(p)]
+    mask = ((xs_arr >= query_rect.xmin) & (xs_arr <= query_rect.xmax) &
+            (ys_arr >= query_rect.ymin) & (ys_arr <= query_rect.ymax))
+    linear_count = int(mask.sum())
     linear_time = time.perf_counter() - start
     
     # QuadTree should be faster
     speedup = linear_time / qt_time if qt_time > 0 else float('inf')
-    print(f"  QuadTree time: {qt_time*1000:.4f} ms")
-    print(f"  Linear time:   {linear_time*1000:.4f} ms")
-    print(f"  Speedup:       {speedup:.2f}x")
+    log.info(f"  QuadTree time: {qt_time*1000:.4f} ms")
+    log.info(f"  Linear time:   {linear_time*1000:.4f} ms")
+    log.info(f"  Speedup:       {speedup:.2f}x")
     
     # Results should be the same
-    assert len(qt_results) == len(linear_results), "Results count should match"
+    assert len(qt_results) == linear_count, "Results count should match"
     
-    print(f"✓ Performance test passed (QuadTree {speedup:.1f}x faster)")
+    log.info(f"✓ Performance test passed (QuadTree {speedup:.1f}x faster)")
+
+
+def _configure_logging():
+    """Emit per-test messages at INFO only when VERBOSE=1 is set."""
+    verbose = os.environ.get('VERBOSE') == '1'
+    logging.basicConfig(format='%(message)s')
+    log.setLevel(logging.INFO if verbose else logging.WARNING)
 
 
 def run_all_tests():
     """Run all tests."""
+    _configure_logging()
     print("="*60)
     print("RUNNING TESTS")
     print("="*60)
@@ -177,8 +579,19 @@ def run_all_tests():
     try:
         test_quadtree_basic()
         test_quadtree_subdivision()
+        test_quadtree_max_depth()
+        test_quadtree_insert_bulk()
+        test_quadtree_bulk_load()
         test_risk_calculation()
         test_normalization_functions()
+        test_vectorized_risk_score()
+        test_score_dataframe()
+        test_regional_aggregation_matches_groupby()
+        test_provincial_analysis_matches_groupby()
+        test_risk_distribution_matches_crosstab()
+        test_summarize_by_region_matches_groupby()
+        test_vectorized_risk_levels()
+        test_read_csv_cached()
         test_performance_characteristics()
         
         print("\n" + "="*60)
@@ -190,8 +603,8 @@ def run_all_tests():
         return False
     except Exception as e:
         print(f"\n✗ Unexpected error: {e}")
-        import traceback
-        traceback.print_exc()
+        # Format the whole traceback first and emit it in one write
+        sys.stderr.write(traceback.format_exc())
         return False
 
 
@@ -0,0 +1,299 @@
+"""
+Test coverage for spatial-tree (cKDTree) distance calculations.
+Tests the build_spatial_tree, find_nearest_fault_distance, and find_nearest_volcano_distance methods.
+"""
+
+import logging
+import os
+import sys
+import traceback
+
+import pandas as pd
+import numpy as np
+from src.risk import RiskCalculator
+
+# Constants for clarity
+APPROX_KM_PER_DEGREE = 111.0  # Approximate kilometers per degree of latitude
+
+# Shared fixtures, built once at import; tests must not mutate them
+FAULTS_DF = pd.DataFrame({
+    'latitude': [-7.0, -7.5, -8.0],
+    'longitude': [110.0, 110.5, 111.0]
+})
+VOLCANOES_DF = pd.DataFrame({
+    'latitude': [-7.5, -8.0, -8.5],
+    'longitude': [110.5, 111.0, 111.5]
+})
+# Corner grid plus the (-7.5, 110.5) fault, shared by the with-tree and
+# coordinate-order tests so both query a single cached tree
+FAULT_GRID_DF = pd.DataFrame({
+    'latitude': [-7.0, -7.5, -7.0, -8.0, -8.0],
+    'longitude': [110.0, 110.5, 111.0, 110.0, 111.0]
+})
+MERAPI_DF = pd.DataFrame({'latitude': [-7.54], 'longitude': [110.44]})
+
+# Per-test progress messages; shown only when VERBOSE=1
+log = logging.getLogger(__name__)
+
+
+def test_build_spatial_tree():
+    """Test spatial tree construction from dataframe."""
+    log.info("Testing build_spatial_tree...")
+    
+    # Test with valid dataframe
+    df = FAULTS_DF
+    tree = RiskCalculator.build_spatial_tree(df)
+    assert tree is not None, "Tree should be created from valid dataframe"
+    
+    # Test with None dataframe
+    tree_none = RiskCalculator.build_spatial_tree(None)
+    assert tree_none is None, "Tree should be None for None dataframe"
+    
+    # Test with empty dataframe
+    df_empty = pd.DataFrame({'latitude': [], 'longitude': []})
+    tree_empty = RiskCalculator.build_spatial_tree(df_empty)
+    assert tree_empty is None, "Tree should be None for empty dataframe"
+    
+    # Cached builder reuses one tree for frames with the same coordinates
+    cached = RiskCalculator.build_spatial_tree_cached(df)
+    assert cached is RiskCalculator.build_spatial_tree_cached(df.copy()), \
+        "Frames with equal coordinates should share a cached tree"
+    assert RiskCalculator.build_spatial_tree_cached(df_empty) is None
+    
+    log.info("✓ build_spatial_tree tests passed")
+
+
+def test_find_nearest_fault_distance_none_tree():
+    """Test fault distance calculation with None tree."""
+    log.info("Testing find_nearest_fault_distance with None tree...")
+    
+    distance = RiskCalculator.find_nearest_fault_distance(-7.0, 110.0, None)
+    assert distance == 200.0, "Should return default max distance of 200.0 when tree is None"
+    
+    log.info("✓ find_nearest_fault_distance with None tree passed")
+
+
+def test_find_nearest_volcano_distance_none_tree():
+    """Test volcano distance calculation with None tree."""
+    log.info("Testing find_nearest_volcano_distance with None tree...")
+    
+    distance = RiskCalculator.find_nearest_volcano_distance(-7.0, 110.0, None)
+    assert distance == 150.0, "Should return default max distance of 150.0 when tree is None"
+    
+    log.info("✓ find_nearest_volcano_distance with None tree passed")
+
+
+def test_find_nearest_fault_distance_with_tree():
+    """Test fault distance calculation with actual tree."""
+    log.info("Testing find_nearest_fault_distance with a spatial tree...")
+    
+    # Known fault locations
+    faults_tree = RiskCalculator.build_spatial_tree_cached(FAULT_GRID_DF)
+    
+    # All four query points go to the tree in one batched call:
+    # 1. exactly at the first fault, 2. exactly at the second fault,
+    # 3. between faults, 4. 0.1 degree latitude south of the first fault
+    lats = [-7.0, -7.5, -7.25, -7.1]
+    lons = [110.0, 110.5, 110.25, 110.0]
+    distances = RiskCalculator.find_nearest_fault_distances(lats, lons, faults_tree)
+    
+    # Test 1: Query a point very close to first fault (should be near 0)
+    assert distances[0] < 1.0, f"Distance to exact fault location should be ~0 km, got {distances[0]}"
+    
+    # Test 2: Query a point exactly at second fault
+    assert distances[1] < 1.0, f"Distance to exact fault location should be ~0 km, got {distances[1]}"
+    
+    # Test 3: Query a point between faults (should be reasonable)
+    assert 0 <= distances[2] <= 100, f"Distance should be reasonable, got {distances[2]}"
+    
+    # Test 4: Verify haversine accuracy - known distance calculation
+    # Distance from (-7.0, 110.0) to (-7.1, 110.0) should be ~11.1 km (approximately 0.1 degree latitude)
+    assert 10 <= distances[3] <= 13, f"Expected ~11.1 km for 0.1 degree latitude, got {distances[3]}"
+    
+    # Scalar queries agree with the batch, including a subclass radius override
+    class HalfRadius(RiskCalculator):
+        EARTH_RADIUS_KM = RiskCalculator.EARTH_RADIUS_KM / 2
+    
+    for calc in (RiskCalculator, HalfRadius):
+        batch = calc.find_nearest_fault_distances(lats, lons, faults_tree)
+        for lat, lon, expected in zip(lats, lons, batch):
+            distance = calc.find_nearest_fault_distance(lat, lon, faults_tree)
+            assert abs(distance - expected) < 1e-9, f"Scalar {distance} != batch {expected}"
+    
+    log.info("✓ find_nearest_fault_distance with a spatial tree passed")
+
+
+def test_find_nearest_volcano_distance_with_tree():
+    """Test volcano distance calculation with actual tree."""
+    log.info("Testing find_nearest_volcano_distance with a spatial tree...")
+    
+    # Known volcano locations
+    volcanoes_tree = RiskCalculator.build_spatial_tree_cached(VOLCANOES_DF)
+    
+    # All four query points go to the tree in one batched call:
+    # 1. exactly at the first volcano, 2. exactly at the second volcano,
+    # 3. between volcanoes, 4. 0.1 degree latitude south of the first volcano
+    lats = [-7.5, -8.0, -7.75, -7.6]
+    lons = [110.5, 111.0, 110.75, 110.5]
+    distances = RiskCalculator.find_nearest_volcano_distances(lats, lons, volcanoes_tree)
+    
+    # Test 1: Query a point very close to first volcano (should be near 0)
+    assert distances[0] < 1.0, f"Distance to exact volcano location should be ~0 km, got {distances[0]}"
+    
+    # Test 2: Query a point exactly at second volcano
+    assert distances[1] < 1.0, f"Distance to exact volcano location should be ~0 km, got {distances[1]}"
+    
+    # Test 3: Query a point between volcanoes (should be reasonable)
+    assert 0 <= distances[2] <= 100, f"Distance should be reasonable, got {distances[2]}"
+    
+    # Test 4: Verify haversine accuracy - known distance calculation
+    # Distance from (-7.5, 110.5) to (-7.6, 110.5) should be ~11.1 km
+    assert 10 <= distances[3] <= 13, f"Expected ~11.1 km for 0.1 degree latitude, got {distances[3]}"
+    
+    log.info("✓ find_nearest_volcano_distance with a spatial tree passed")
+
+
+def test_haversine_vs_euclidean_accuracy():
+    """Test that haversine distance is more accurate than Euclidean approximation."""
+    log.info("Testing haversine accuracy vs Euclidean approximation...")
+    
+    # A fault at Mount Merapi approximate location
+    faults_tree = RiskCalculator.build_spatial_tree_cached(MERAPI_DF)
+    
+    # Query from a point ~100 km away (approximately)
+    # Using haversine distance
+    query_lat, query_lon = -8.0, 110.44
+    haversine_dist = RiskCalculator.find_nearest_fault_distance(query_lat, query_lon, faults_tree)
+    
+    # Simplified latitude-only Euclidean approximation (same longitude)
+    # For same longitude, distance is just the latitude difference in km
+    euclidean_approx = abs(query_lat - (-7.54)) * APPROX_KM_PER_DEGREE
+    
+    # Haversine should give a slightly different (more accurate) result
+    # For this case, they should be close but not identical
+    log.info(f"  Haversine distance: {haversine_dist:.2f} km")
+    log.info(f"  Euclidean approximation: {euclidean_approx:.2f} km")
+    
+    # Both should be in reasonable range
+    assert 40 <= haversine_dist <= 60, f"Haversine distance should be ~50 km, got {haversine_dist}"
+    assert 40 <= euclidean_approx <= 60, f"Euclidean approximation should be ~50 km, got {euclidean_approx}"
+    
+    # For this simple case (same longitude), they should be very close
+    diff = abs(haversine_dist - euclidean_approx)
+    assert diff < 2, f"For same longitude, difference should be small, got {diff}"
+    
+    log.info("✓ Haversine accuracy test passed")
+
+
+def test_coordinate_order():
+    """Test that latitude/longitude order is correct."""
+    log.info("Testing coordinate order (latitude, longitude)...")
+    
+    # A simple grid of faults (plus one interior fault)
+    faults_tree = RiskCalculator.build_spatial_tree_cached(FAULT_GRID_DF)
+    
+    # Query the exact point of first fault
+    distance_1 = RiskCalculator.find_nearest_fault_distance(-7.0, 110.0, faults_tree)
+    
+    # Query the exact point of last fault
+    distance_2 = RiskCalculator.find_nearest_fault_distance(-8.0, 111.0, faults_tree)
+    
+    # Both should be very close to 0 if coordinates are correct
+    assert distance_1 < 1.0, f"First fault should be at distance ~0, got {distance_1}"
+    assert distance_2 < 1.0, f"Last fault should be at distance ~0, got {distance_2}"
+    
+    log.info("✓ Coordinate order test passed")
+
+
+def test_batched_distances_match_scalar():
+    """Test that batched distance queries match per-point queries."""
+    log.info("Testing batched nearest-distance queries...")
+    
+    faults_tree = RiskCalculator.build_spatial_tree_cached(FAULTS_DF)
+    
+    lats = np.array([-7.0, -7.25, -7.1, -8.4])
+    lons = np.array([110.0, 110.25, 110.0, 111.3])
+    
+    fault_batch = RiskCalculator.find_nearest_fault_distances(lats, lons, faults_tree)
+    volcano_batch = RiskCalculator.find_nearest_volcano_distances(lats, lons, faults_tree)
+    for i in range(len(lats)):
+        expected = RiskCalculator.find_nearest_fault_distance(lats[i], lons[i], faults_tree)
+        assert abs(fault_batch[i] - expected) < 1e-9, f"Batch {fault_batch[i]} != scalar {expected}"
+        expected = RiskCalculator.find_nearest_volcano_distance(lats[i], lons[i], faults_tree)
+        assert abs(volcano_batch[i] - expected) < 1e-9, f"Batch {volcano_batch[i]} != scalar {expected}"
+    
+    # None tree falls back to the same defaults as the scalar methods
+    assert (RiskCalculator.find_nearest_fault_distances(lats, lons, None) == 200.0).all()
+    assert (RiskCalculator.find_nearest_volcano_distances(lats, lons, None) == 150.0).all()
+    assert (RiskCalculator.find_nearest_distances_batch(lats, lons, None, 75.0) == 75.0).all()
+    assert np.array_equal(RiskCalculator.find_nearest_distances_batch(lats, lons, faults_tree, 200.0),
+                          fault_batch)
+    
+    log.info("✓ Batched nearest-distance queries passed")
+
+
+def test_haversine_distance_vectorized():
+    """Test that haversine_distance accepts arrays and agrees with the spatial tree."""
+    log.info("Testing vectorized haversine_distance...")
+    
+    faults_tree = RiskCalculator.build_spatial_tree_cached(MERAPI_DF)
+    
+    lats = np.array([-8.0, -7.0, -7.54])
+    lons = np.array([110.44, 111.0, 110.44])
+    distances = RiskCalculator.haversine_distance(lats, lons, -7.54, 110.44)
+    assert distances.shape == lats.shape, "Should return one distance per point"
+    
+    expected = RiskCalculator.find_nearest_fault_distances(lats, lons, faults_tree)
+    assert np.allclose(distances, expected), f"Expected {expected}, got {distances}"
+    
+    # Scalar inputs take the math path and still match the array results
+    for lat, lon, expected in zip(lats.tolist(), lons.tolist(), distances):
+        scalar = RiskCalculator.haversine_distance(lat, lon, -7.54, 110.44)
+        assert isinstance(scalar, float), f"Expected a float, got {type(scalar)}"
+        assert abs(scalar - expected) < 1e-9, "Scalar and array results should match"
+    
+    log.info("✓ Vectorized haversine_distance passed")
+
+
+def _configure_logging():
+    """Emit per-test messages at INFO only when VERBOSE=1 is set."""
+    verbose = os.environ.get('VERBOSE') == '1'
+    logging.basicConfig(format='%(message)s')
+    log.setLevel(logging.INFO if verbose else logging.WARNING)
+
+
+def run_all_spatial_tree_tests():
+    """Run all spatial tree tests."""
+    _configure_logging()
+    print("=" * 60)
+    print("RUNNING SPATIAL TREE TESTS")
+    print("=" * 60)
+    
+    try:
+        test_build_spatial_tree()
+        test_find_nearest_fault_distance_none_tree()
+        test_find_nearest_volcano_distance_none_tree()
+        test_find_nearest_fault_distance_with_tree()
+        test_find_nearest_volcano_distance_with_tree()
+        test_haversine_vs_euclidean_accuracy()
+        test_coordinate_order()
+        test_batched_distances_match_scalar()
+        test_haversine_distance_vectorized()
+        
+        print("\n" + "=" * 60)
+        print("ALL SPATIAL TREE TESTS PASSED ✓")
+        print("=" * 60)
+        return True
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        return False
+    except Exception as e:
+        print(f"\n✗ Unexpected error: {e}")
+        # Format the whole traceback first and emit it in one write
+        sys.stderr.write(traceback.format_exc())
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_spatial_tree_tests()
+    exit(0 if success else 1)